@@ -0,0 +1 @@
+"""Non-UI logic: used by the tabs and by the command line (python -m logic, from src/)."""
@@ -0,0 +1,100 @@
+"""Run scripts and browse their logs without the GUI.
+
+    python -m logic list
+    python -m logic run <script> [--flags dev ...]
+    python -m logic history <script>
+
+Run from src/. Runs are logged to logs/<script>/ exactly like GUI runs.
+"""
+import argparse
+import os
+import sys
+import threading
+
+from .log_index import index_path, read_summary
+from .run_manager import Run
+from .runner import ScriptRunner
+
+DEFAULT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _list(runner, args):
+    for filename, display_name, description, flags in runner.get_scripts_metadata():
+        flags_text = f"  [flags: {', '.join(flags)}]" if flags else ""
+        print(f"{filename:<36} {description}{flags_text}")
+    return 0
+
+
+def _history(runner, args):
+    log_dir = runner.log_store.script_dir(args.script)
+    for filename in runner.log_store.list_logs(args.script):
+        summary = read_summary(index_path(os.path.join(log_dir, filename)))
+        counts = f"  errors: {summary[1]}  warnings: {summary[2]}" if summary else ""
+        print(f"{filename}{counts}")
+    return 0
+
+
+def _run(runner, args):
+    if args.script not in runner.scripts:
+        print(f"Unknown script: {args.script}", file=sys.stderr)
+        return 2
+
+    run = Run(args.script, args.flags)
+    done = threading.Event()
+    finalized = threading.Event()
+
+    def on_output(text, tag):
+        if args.quiet:
+            return
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def forward_input():
+        # Scripts that prompt read our stdin, a line at a time
+        for line in sys.stdin:
+            while run.process is None and not done.wait(0.05):
+                pass # Still starting up
+            if done.is_set() or not runner.send_input(run, line.rstrip('\r\n')):
+                break
+
+    runner.start(run, on_output, on_finished=lambda run: done.set(), on_logs_finalized=lambda script_name: finalized.set())
+    threading.Thread(target=forward_input, name='stdin', daemon=True).start()
+    try:
+        while not done.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        runner.abort(run)
+        done.wait()
+
+    if run.log_path:
+        finalized.wait(60) # Let compression and retention finish before exiting
+        print(f"Log: {run.log_path}", file=sys.stderr)
+    if run.returncode is None:
+        return 1
+    return run.returncode if run.returncode >= 0 else 128 - run.returncode # Killed by a signal
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m logic', description="Run scripts and browse their logs without the GUI.")
+    parser.add_argument('--root', default=DEFAULT_ROOT, help="project root holding scripts/, logs/ and settings.json")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="list the available scripts")
+
+    run_parser = commands.add_parser('run', help="run a script, streaming its output; exits with its exit code")
+    run_parser.add_argument('script', help="script file name, e.g. test_python_features.py")
+    run_parser.add_argument('--flags', nargs='*', default=[], help="flags passed to the script")
+    run_parser.add_argument('--quiet', action='store_true', help="don't echo the output (it is still logged)")
+
+    history_parser = commands.add_parser('history', help="list a script's logs, newest first")
+    history_parser.add_argument('script')
+
+    args = parser.parse_args(argv)
+    runner = ScriptRunner(args.root)
+    runner.scan_scripts()
+    handlers = {'list': _list, 'run': _run, 'history': _history}
+    return handlers[args.command](runner, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
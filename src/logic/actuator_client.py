@@ -0,0 +1,262 @@
+import hashlib
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+PENDING = '…' # Status shown until an endpoint has answered
+
+
+class EndpointState:
+    """What is remembered about one endpoint between polls (see ActuatorClient.fetch)."""
+
+    def __init__(self, app, region, base_url):
+        self.app = app
+        self.region = region
+        self.base_url = base_url
+        self.payloads = {} # url -> (etag, body digest, (status, data))
+        self.row = None
+        self.failures = 0 # Polls in a row that found it DOWN or unreachable
+
+    @property
+    def key(self):
+        return (self.app, self.region)
+
+
+def endpoints_from_settings(settings):
+    # [(app, region, base_url)] from {"App": {"region": "https://base-url"}}, in file order
+    return [(app, region, base_url.rstrip('/'))
+            for app, regions in settings['actuator_endpoints'].items()
+            for region, base_url in regions.items()]
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port), reused across requests."""
+
+    def __init__(self, timeout, max_idle_per_host=32):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle = {} # (scheme, host, port) -> [HTTPConnection]
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        # (connection, reused)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self.connect(key), False
+
+    def connect(self, key):
+        # A new connection; it connects lazily on the first request
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(host, port, timeout=self.timeout)
+
+    def release(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        with self._lock:
+            connections = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+
+class ActuatorClient:
+    """Reads /actuator/info and /actuator/health of Spring Boot services.
+
+    Requests go through a keep-alive pool and time out after timeout seconds
+    (per connect and per read). fetch_all() queries many endpoints at once on
+    at most max_workers threads.
+    """
+
+    def __init__(self, timeout=5.0, max_workers=200):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.pool = ConnectionPool(timeout)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='actuator')
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(timeout=settings['actuator_timeout'], max_workers=settings['actuator_workers'])
+
+    def get(self, url, headers=None):
+        """(HTTP status, ETag header or None, body bytes). Raises OSError/HTTPException if unreachable."""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        connection, reused = self.pool.acquire(key)
+        try:
+            response = self._request(connection, path, headers)
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            if not reused:
+                raise
+            # The server may have dropped the idle connection: one retry on a fresh one
+            connection = self.pool.connect(key)
+            try:
+                response = self._request(connection, path, headers)
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                raise
+        self.pool.release(key, connection)
+        return response
+
+    @staticmethod
+    def _request(connection, path, headers=None):
+        connection.request('GET', path, headers={'Accept': 'application/json', **(headers or {})})
+        response = connection.getresponse()
+        body = response.read() # Read fully so the connection can be reused
+        return response.status, response.getheader('ETag'), body
+
+    def get_json(self, url):
+        """(HTTP status, decoded JSON or None). Raises OSError/HTTPException if unreachable.
+
+        Non-2xx answers are returned, not raised: /health answers 503 with a body when DOWN.
+        """
+        status, _, body = self.get(url)
+        return status, _decode(body)
+
+    def _get_cached(self, url, state):
+        # (status, data), and whether it differs from the last poll. A 304 to If-None-Match,
+        # or a body with the same digest, is reused without decoding it again.
+        etag, digest, payload = state.payloads.get(url, (None, None, None))
+        status, new_etag, body = self.get(url, {'If-None-Match': etag} if etag and payload else None)
+        if status == 304 and payload:
+            return payload, False
+        new_digest = hashlib.blake2b(body, digest_size=16).digest()
+        if new_digest == digest and payload and payload[0] == status:
+            return payload, False
+        payload = (status, _decode(body))
+        state.payloads[url] = (new_etag, new_digest, payload)
+        return payload, True
+
+    def fetch(self, app, region, base_url, state=None):
+        """One table row: (app, region, version, branch, commit_id, status).
+
+        With the endpoint's EndpointState, requests are conditional, an
+        unchanged endpoint returns its previous row without parsing anything,
+        and the row is remembered in state.row.
+        """
+        try:
+            if state is None:
+                info = self.get_json(base_url + '/actuator/info')
+                health = self.get_json(base_url + '/actuator/health')
+            else:
+                info, info_changed = self._get_cached(base_url + '/actuator/info', state)
+                health, health_changed = self._get_cached(base_url + '/actuator/health', state)
+                if state.row and not (info_changed or health_changed):
+                    return state.row
+        except (OSError, http.client.HTTPException, ValueError): # ValueError: a malformed URL
+            row = (app, region, '', '', '', 'UNREACHABLE')
+            if state is not None:
+                state.payloads.clear() # Nothing to compare the next answer with
+        else:
+            row = _row(app, region, info[1], health[0], health[1])
+        if state is not None:
+            state.row = row
+        return row
+
+    def fetch_all(self, endpoints, on_result, on_done=None, states=None):
+        """Fetches every (app, region, base_url) concurrently; returns a FetchJob.
+
+        on_result(row) is called from worker threads as each endpoint answers,
+        on_done() once all have. Nothing more is delivered after job.cancel().
+        states maps (app, region) to the EndpointState to fetch with, if any.
+        """
+        return FetchJob(self, endpoints, on_result, on_done, states).start()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.close()
+
+
+def _decode(body):
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return None
+
+
+def _row(app, region, info, health_status, health):
+    info = info if isinstance(info, dict) else {}
+    build = info.get('build') if isinstance(info.get('build'), dict) else {}
+    git = info.get('git') if isinstance(info.get('git'), dict) else {}
+    commit = git.get('commit')
+    # git.commit is {"id": ...} in the default mode, a plain id in some setups
+    commit_id = commit.get('id', '') if isinstance(commit, dict) else (commit or '')
+    if isinstance(health, dict) and health.get('status'):
+        status = str(health['status'])
+    else:
+        status = f"HTTP {health_status}"
+    return (app, region, str(build.get('version', '')), str(git.get('branch', '')), str(commit_id), status)
+
+
+class FetchJob:
+    """One refresh: every endpoint fetched on the client's executor."""
+
+    def __init__(self, client, endpoints, on_result, on_done=None, states=None):
+        self.client = client
+        self.endpoints = list(endpoints)
+        self.states = states or {}
+        self.on_result = on_result
+        self.on_done = on_done
+        self.total = len(self.endpoints)
+        self.completed = 0
+        self.started_at = None
+        self.finished_at = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+        self._futures = []
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        if not self.endpoints:
+            self._finish()
+        for endpoint in self.endpoints:
+            self._futures.append(self.client.executor.submit(self._fetch, endpoint))
+        return self
+
+    def cancel(self):
+        self._cancelled = True
+        for future in self._futures:
+            future.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    @property
+    def duration(self):
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def _fetch(self, endpoint):
+        if self._cancelled:
+            return
+        app, region, base_url = endpoint
+        row = self.client.fetch(app, region, base_url, self.states.get((app, region)))
+        if self._cancelled:
+            return
+        self.on_result(row)
+        with self._lock:
+            self.completed += 1
+            done = self.completed == self.total
+        if done:
+            self._finish()
+
+    def _finish(self):
+        self.finished_at = time.perf_counter()
+        if self.on_done and not self._cancelled:
+            self.on_done()
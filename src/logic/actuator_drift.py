@@ -0,0 +1,56 @@
+from collections import Counter
+
+
+def build_label(version, commit_id):
+    # What a region runs, as shown in a drift cell: "1.4.2 @3f9c2ab"
+    commit = commit_id[:7]
+    if version and commit:
+        return f"{version} @{commit}"
+    return version or (f"@{commit}" if commit else '')
+
+
+class AppDrift:
+    """One app across regions: the build each region runs and where they disagree."""
+
+    def __init__(self, app, builds, statuses):
+        self.app = app
+        self.builds = builds # region -> (version, commit_id), regions that reported one
+        self.statuses = statuses # region -> status, every region the app is deployed to
+        counts = Counter(builds.values())
+        # The build most regions run; regions running anything else have drifted
+        self.majority = counts.most_common(1)[0][0] if counts else None
+        self.outliers = {region for region, build in builds.items() if build != self.majority}
+
+    @property
+    def drifted(self):
+        return bool(self.outliers)
+
+    def cell(self, region):
+        # Cell text: the build, or the status when the region reported none ('' if not deployed)
+        build = self.builds.get(region)
+        if build is None:
+            return self.statuses.get(region, '')
+        return build_label(*build)
+
+
+def drift_view(rows, only_drifted=False):
+    """(regions, [AppDrift]) from actuator rows (app, region, version, branch, commit_id, status).
+
+    Rows are grouped by app in one pass; apps keep the order of their first row and
+    regions are sorted. Regions that reported neither a version nor a commit (down,
+    unreachable, still pending) don't count towards drift.
+    """
+    builds = {}
+    statuses = {}
+    regions = set()
+    for app, region, version, _, commit_id, status in rows:
+        regions.add(region)
+        statuses.setdefault(app, {})[region] = status
+        app_builds = builds.setdefault(app, {})
+        if version or commit_id:
+            app_builds[region] = (version, commit_id)
+
+    apps = [AppDrift(app, app_builds, statuses[app]) for app, app_builds in builds.items()]
+    if only_drifted:
+        apps = [app for app in apps if app.drifted]
+    return sorted(regions), apps
@@ -0,0 +1,151 @@
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .actuator_client import PENDING
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS endpoints (
+    id INTEGER PRIMARY KEY,
+    app TEXT NOT NULL,
+    region TEXT NOT NULL,
+    UNIQUE (app, region)
+);
+-- One row per change of an endpoint's answer, not per poll; build_changed marks
+-- a new (version, commit) compared to the last one the endpoint reported
+CREATE TABLE IF NOT EXISTS changes (
+    endpoint_id INTEGER NOT NULL,
+    time REAL NOT NULL,
+    version TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    commit_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    build_changed INTEGER NOT NULL,
+    PRIMARY KEY (endpoint_id, time)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS builds ON changes (endpoint_id, time) WHERE build_changed;
+'''
+
+# Queries walk the endpoints and seek each one's changes by (endpoint_id, time), so they
+# cost a few index seeks per endpoint however long the history is. CROSS JOIN and
+# INDEXED BY pin that plan: left to itself, SQLite scans every change instead.
+
+# Every endpoint's last change at or before a time
+ROWS_AT = '''
+SELECT e.app, e.region, c.version, c.branch, c.commit_id, c.status
+FROM endpoints e CROSS JOIN changes c
+WHERE c.endpoint_id = e.id
+AND c.time = (SELECT MAX(time) FROM changes WHERE endpoint_id = e.id AND time <= ?)
+'''
+
+# Every endpoint's build before its latest build change
+PREVIOUS_BUILDS = '''
+SELECT e.app, e.region, c.version, c.branch, c.commit_id, c.status
+FROM endpoints e CROSS JOIN changes c
+WHERE c.endpoint_id = e.id
+AND c.time = (SELECT MAX(p.time) FROM changes p INDEXED BY builds WHERE p.endpoint_id = e.id AND p.build_changed
+              AND p.time < (SELECT MAX(d.time) FROM changes d INDEXED BY builds WHERE d.endpoint_id = e.id AND d.build_changed))
+'''
+
+# Every endpoint's latest build
+LAST_BUILDS = '''
+SELECT e.id, c.version, c.commit_id
+FROM endpoints e CROSS JOIN changes c
+WHERE c.endpoint_id = e.id
+AND c.time = (SELECT MAX(time) FROM changes INDEXED BY builds WHERE endpoint_id = e.id AND build_changed)
+'''
+
+BUILDS = '''
+SELECT c.time, e.region, c.version, c.branch, c.commit_id
+FROM endpoints e CROSS JOIN changes c INDEXED BY builds
+WHERE e.app = ? AND c.endpoint_id = e.id AND c.build_changed
+ORDER BY c.time DESC
+'''
+
+
+class ActuatorHistory:
+    """Actuator rows over time, in a SQLite file: what every region ran, and when it changed.
+
+    record() is called with every answer, but only answers that differ from the
+    endpoint's previous one are written, so polling every minute for months
+    stays small and queries stay fast. All work runs on one background thread,
+    which owns the connection; every method returns a Future.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = None
+        self._ids = {} # (app, region) -> endpoint id
+        self._last = {} # endpoint id -> (version, branch, commit_id, status) last written
+        self._builds = {} # endpoint id -> (version, commit_id) last reported
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='actuator-history')
+
+    def _open(self):
+        # Called on the worker
+        if self._db is not None:
+            return self._db
+        db = sqlite3.connect(self.path)
+        db.execute('PRAGMA journal_mode=WAL') # Readers never wait on the writer
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.executescript(SCHEMA)
+        for endpoint_id, app, region in db.execute('SELECT id, app, region FROM endpoints'):
+            self._ids[(app, region)] = endpoint_id
+        for app, region, version, branch, commit_id, status in db.execute(ROWS_AT, (float('inf'),)):
+            self._last[self._ids[(app, region)]] = (version, branch, commit_id, status)
+        for endpoint_id, version, commit_id in db.execute(LAST_BUILDS):
+            self._builds[endpoint_id] = (version, commit_id)
+        self._db = db
+        return db
+
+    def record(self, rows, taken_at=None):
+        """Stores the rows that changed since the endpoint's last one; the Future gives how many."""
+        return self._executor.submit(self._record, list(rows), taken_at or time.time())
+
+    def _record(self, rows, taken_at):
+        db = self._open()
+        changes = []
+        for app, region, version, branch, commit_id, status in rows:
+            if status == PENDING:
+                continue
+            endpoint_id = self._ids.get((app, region))
+            if endpoint_id is None:
+                endpoint_id = db.execute('INSERT INTO endpoints (app, region) VALUES (?, ?)', (app, region)).lastrowid
+                self._ids[(app, region)] = endpoint_id
+            answer = (version, branch, commit_id, status)
+            if self._last.get(endpoint_id) == answer:
+                continue
+            self._last[endpoint_id] = answer
+            # Answers without a build (down, unreachable) don't count as a deploy
+            build_changed = False
+            if version or commit_id:
+                build_changed = self._builds.get(endpoint_id) != (version, commit_id)
+                self._builds[endpoint_id] = (version, commit_id)
+            changes.append((endpoint_id, taken_at, version, branch, commit_id, status, build_changed))
+        if changes:
+            db.executemany('INSERT OR REPLACE INTO changes VALUES (?, ?, ?, ?, ?, ?, ?)', changes)
+        db.commit()
+        return len(changes)
+
+    def rows_at(self, when):
+        """Every endpoint's row as it was at time when (seconds since the epoch)."""
+        return self._executor.submit(self._query, ROWS_AT, (when,))
+
+    def previous_builds(self):
+        """Every endpoint's row from before its last deploy (endpoints deployed only once are left out)."""
+        return self._executor.submit(self._query, PREVIOUS_BUILDS, ())
+
+    def builds(self, app):
+        """(time, region, version, branch, commit_id) of every deploy of app seen, newest first."""
+        return self._executor.submit(self._query, BUILDS, (app,))
+
+    def _query(self, sql, params):
+        return self._open().execute(sql, params).fetchall()
+
+    def close(self):
+        self._executor.submit(self._close)
+        self._executor.shutdown(wait=False)
+
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
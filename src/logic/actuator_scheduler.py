@@ -0,0 +1,123 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from .actuator_client import EndpointState
+
+
+class ActuatorScheduler:
+    """Polls every endpoint on its own timer, from one thread, without blocking anyone.
+
+    Endpoints that are UP are polled every interval seconds; DOWN or unreachable
+    ones wait twice as long after each failed poll, up to max_backoff. Every
+    delay is spread by +/- jitter (a fraction) so regions aren't hit in lockstep.
+    Requests are conditional (see ActuatorClient.fetch), and on_result(row) is
+    called from a worker thread only when an endpoint's row differs from the
+    last one delivered, so changes found while stopped arrive after start().
+    """
+
+    def __init__(self, client, endpoints, on_result, interval=30.0, max_backoff=600.0, jitter=0.2):
+        self.client = client
+        self.on_result = on_result
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.states = {} # (app, region) -> EndpointState
+        self._delivered = {} # (app, region) -> row last passed to on_result
+        self._heap = [] # (due, seq, state)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._generation = 0 # Bumped by start() and stop(); a loop runs only while its generation is current
+        self._thread = None
+        self.set_endpoints(endpoints)
+
+    @classmethod
+    def from_settings(cls, client, endpoints, on_result, settings):
+        return cls(client, endpoints, on_result, interval=settings['actuator_poll_interval'],
+                   max_backoff=settings['actuator_max_backoff'], jitter=settings['actuator_jitter'])
+
+    def _spread(self, delay):
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def set_endpoints(self, endpoints):
+        # New endpoints are first polled within one interval, at random, removed ones are dropped
+        with self._cond:
+            states = {}
+            for app, region, base_url in endpoints:
+                state = self.states.get((app, region))
+                if state is None or state.base_url != base_url:
+                    state = EndpointState(app, region, base_url)
+                    self._push(state, random.uniform(0, self.interval))
+                states[state.key] = state
+            self.states = states
+            self._cond.notify()
+
+    def _push(self, state, delay):
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), state))
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return self
+            self._generation += 1
+            self._thread = threading.Thread(target=self._run, args=(self._generation,),
+                                            name='actuator-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        # The loop exits as soon as it wakes, so a following start() never runs two of them
+        with self._cond:
+            self._generation += 1
+            self._thread = None
+            self._cond.notify_all()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def _run(self, generation):
+        with self._cond:
+            while generation == self._generation:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, _, state = self._heap[0]
+                if self.states.get(state.key) is not state:
+                    heapq.heappop(self._heap) # Removed from the inventory
+                    continue
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay) # Woken early by changes to the schedule
+                    continue
+                heapq.heappop(self._heap)
+                self.client.executor.submit(self._poll, state)
+
+    def _poll(self, state):
+        previous = state.row
+        try:
+            row = self.client.fetch(state.app, state.region, state.base_url, state)
+        except Exception as e:
+            print(f"Actuator poll failed: {e}")
+            row = previous or (state.app, state.region, '', '', '', 'UNREACHABLE')
+
+        if row[5] == 'UP':
+            state.failures = 0
+            delay = self.interval
+        else:
+            state.failures += 1
+            delay = min(self.interval * 2 ** min(state.failures, 20), self.max_backoff)
+
+        with self._cond:
+            if self.states.get(state.key) is state:
+                self._push(state, self._spread(delay))
+                self._cond.notify()
+            # Compared with what was delivered, not state.row: manual refreshes and polls
+            # finishing after stop() update that without anyone hearing about it
+            deliver = self.running and self._delivered.get(state.key) != row
+            if deliver:
+                self._delivered[state.key] = row
+        if deliver:
+            self.on_result(row)
@@ -0,0 +1,163 @@
+import re
+
+# Severity rules as (tag, regex). Rules are searched in the lowercased line, and
+# tags rank by first appearance: a line with both an error and an info marker is
+# tagged 'error'.
+#
+# Batches are scanned as one text joined with a leading newline. Keeping every
+# alternative literal-first (anchoring on "\n" rather than "^") lets the regex
+# engine skip ahead on the first character instead of trying every position.
+_END = r'(?:[ \t]*$|\]|:)'
+DEFAULT_RULES = [
+    ('error', rf'\n[ \t]*error{_END}|\[error{_END}|exception:|critical'),
+    ('warning', rf'\n[ \t]*warn(?:ing)?{_END}|\[warn(?:ing)?{_END}'),
+    ('info', rf'\n[ \t]*info{_END}|\[info{_END}'),
+]
+
+# Extra rules for common build tools, enabled by name in settings.json ("log_rules": ["maven"])
+PRESETS = {
+    'maven': [
+        ('error', r'\n[ \t]*build failure|\[fatal\]'),
+        ('info', r'\n[ \t]*build success'),
+    ],
+    'gradle': [
+        ('error', r'\n[ \t]*failure: build failed|\n[ \t]*build failed|\n[ \t]*> task \S+ failed|:\d+: error:'),
+        ('warning', r':\d+: warning:'),
+        ('info', r'\n[ \t]*build successful'),
+    ],
+}
+
+
+class LineClassifier:
+    """Tags log lines by severity using a single precompiled pattern."""
+
+    def __init__(self, rules=None):
+        self._rules = list(DEFAULT_RULES if rules is None else rules)
+        self._compile()
+
+    @classmethod
+    def from_settings(cls, settings):
+        # "log_rules" entries are preset names or [tag, pattern] pairs; bad ones are reported and skipped
+        classifier = cls()
+        for rule in settings.get('log_rules', []):
+            try:
+                if isinstance(rule, str):
+                    if rule.lower() not in PRESETS:
+                        raise ValueError(f"unknown preset (known: {', '.join(PRESETS)})")
+                    for tag, pattern in PRESETS[rule.lower()]:
+                        classifier.add_rule(tag, pattern)
+                else:
+                    tag, pattern = rule
+                    classifier.add_rule(tag, pattern)
+            except (re.error, TypeError, ValueError) as e:
+                print(f"Log rule {rule!r} skipped: {e}")
+        return classifier
+
+    def add_rule(self, tag, pattern):
+        # Checked as part of the combined patterns: one can compile alone and still break
+        # them (a global flag like "(?i)" is only allowed at the very start)
+        self._rules.append((tag, pattern))
+        try:
+            self._compile()
+        except Exception:
+            self._rules.pop()
+            self._compile()
+            raise
+
+    def _compile(self):
+        # Per-tag patterns, in priority order, to resolve which tag a hit belongs to
+        grouped = {}
+        for tag, pattern in self._rules:
+            grouped.setdefault(tag, []).append(pattern)
+        self._tag_patterns = [(tag, re.compile('|'.join(patterns), re.MULTILINE)) for tag, patterns in grouped.items()]
+
+        # The scan pattern is a flat alternation of every rule. Capture groups would
+        # stop the engine from using the first-character shortcut, so tags are
+        # resolved afterwards, only for the positions that actually matched.
+        if self._rules:
+            self._pattern = re.compile('|'.join(pattern for _, pattern in self._rules), re.MULTILINE)
+        else:
+            self._pattern = None
+
+    @property
+    def tags(self):
+        # Tag names in priority order
+        return [tag for tag, _ in self._tag_patterns]
+
+    def classify(self, line):
+        return self.classify_batch([line])[0]
+
+    def classify_batch(self, lines):
+        # Classify many lines with one regex pass over the joined, lowercased text.
+        # Lines may keep their line endings but must not contain embedded newlines.
+        tags = [None] * len(lines)
+        if self._pattern is None or not lines:
+            return tags
+
+        text = '\n' + '\n'.join([line.rstrip('\r\n') for line in lines]).lower()
+        best = {} # line -> rank of the best tag seen so far
+        line_no = -1 # The leading newline is counted too
+        pos = 0
+        for m in self._pattern.finditer(text):
+            end = m.end()
+            line_no += text.count('\n', pos, end)
+            pos = end
+
+            current = best.get(line_no)
+            if current == 0:
+                continue
+            start = m.start()
+            for rank, (tag, pattern) in enumerate(self._tag_patterns):
+                if current is not None and rank >= current:
+                    break
+                if pattern.match(text, start):
+                    best[line_no] = rank
+                    break
+
+        for line_no, rank in best.items():
+            tags[line_no] = self._tag_patterns[rank][0]
+        return tags
+
+
+if __name__ == "__main__":
+    # Microbenchmark: python -m logic.classifier (from src/)
+    import random
+    import time
+
+    # Typical build output: mostly plain lines, ~10% carrying a severity marker
+    plain = [
+        "Compiling module foo/bar/baz.py",
+        "   at com.example.Foo.bar(Foo.java:42)",
+        "Processed 1000 records in 12ms",
+        "Downloading https://repo.example.com/lib-1.2.3.jar (12 kB)",
+        "",
+    ]
+    marked = [
+        "[INFO] Downloading artifact com.example:lib:1.2.3",
+        "[WARNING] Deprecated API usage in Foo.java",
+        "ERROR: connection refused",
+        "java.lang.IllegalStateException: boom",
+    ]
+    random.seed(0)
+    lines = [random.choice(marked if random.random() < 0.1 else plain) + "\n" for _ in range(200000)]
+
+    def legacy(line):
+        lower_text = line.lower().strip()
+        if re.search(r'(^|\[)error($|\]|:)', lower_text) or "exception:" in lower_text or "critical" in lower_text:
+            return 'error'
+        elif re.search(r'(^|\[)warn(ing)?($|\]|:)', lower_text):
+            return 'warning'
+        elif re.search(r'(^|\[)info($|\]|:)', lower_text):
+            return 'info'
+        return None
+
+    classifier = LineClassifier()
+
+    def bench(label, fn):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {len(lines) / elapsed:>14,.0f} lines/sec")
+
+    bench("legacy per-line cascade", lambda: [legacy(l) for l in lines])
+    bench("classify_batch()", lambda: classifier.classify_batch(lines))
@@ -0,0 +1,86 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+
+class HistorySearch:
+    """Searches every stored log of every script on a thread pool.
+
+    Each log is memory-mapped (compressed ones inflated first) and scanned with
+    a bytes pattern from compile_query(..., binary=True). For every log,
+    on_results(script, filename, hits, truncated) is called from a worker
+    thread, with hits as (line, text) pairs - 0-based line, one hit per line.
+    After cancel() nothing more is delivered.
+    """
+
+    def __init__(self, log_store, pattern, on_results, max_workers=4, max_hits_per_log=1000):
+        self.log_store = log_store
+        self.pattern = pattern
+        self.on_results = on_results
+        self.max_workers = max_workers
+        self.max_hits_per_log = max_hits_per_log
+        self.total = 0
+        self._cancelled = threading.Event()
+        self._executor = None
+
+    def logs(self):
+        # (script, filename) of every stored log
+        return [(script, filename) for script in self.log_store.scripts()
+                for filename in self.log_store.list_logs(script)]
+
+    def start(self):
+        logs = self.logs()
+        self.total = len(logs)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='history-search')
+        for script, filename in logs:
+            self._executor.submit(self._search_log, script, filename)
+        self._executor.shutdown(wait=False)
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _search_log(self, script, filename):
+        if self.cancelled:
+            return
+        hits = []
+        truncated = False
+        path = self.log_store.resolve(script, filename)
+        try:
+            if path:
+                with self.log_store.open_paged(path) as log:
+                    truncated = self._scan(log.data, hits)
+        except Exception as e:
+            print(f"Search of {script}/{filename} failed: {e}")
+        if not self.cancelled:
+            self.on_results(script, filename, hits, truncated)
+
+    def _scan(self, data, hits):
+        # Returns True if the hit limit stopped the scan
+        line = 0
+        pos = 0
+        last_line = -1
+        for m in self.pattern.finditer(data):
+            start = m.start()
+            line += data[pos:start].count(b'\n') # mmap has no count()
+            pos = start
+            if line == last_line:
+                continue
+            last_line = line
+            line_start = data.rfind(b'\n', 0, start) + 1
+            line_end = data.find(b'\n', start)
+            if line_end < 0:
+                line_end = len(data)
+            text = data[line_start:min(line_end, line_start + 500)].decode('utf-8', errors='replace')
+            hits.append((line, text.rstrip('\r\n')))
+            if len(hits) >= self.max_hits_per_log:
+                return True
+            if self.cancelled:
+                return False
+        return False
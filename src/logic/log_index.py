@@ -0,0 +1,228 @@
+import itertools
+import operator
+import os
+import struct
+from array import array
+
+# Sidecar index of a run log, <name>.log.idx (kept when the log is compressed):
+#
+#   header  MAGIC, u16 length, tab-separated tag names (code N = Nth name, 0 = untagged)
+#   blocks  u32 n, n x u32 line lengths in bytes, n x u8 tag codes - one per write
+#   footer  FOOTER_MAGIC, u64 lines, u64 errors, u64 warnings - only once the log is closed
+#
+# An index without a footer (run still going, or crashed) is treated as missing.
+MAGIC = b'LOGIDX1\n'
+FOOTER_MAGIC = b'LOGIDXE\n'
+_LENGTH = struct.Struct('<H')
+_BLOCK = struct.Struct('<I')
+_FOOTER = struct.Struct('<8sQQQ')
+
+
+def index_path(log_path):
+    if log_path.endswith('.gz'):
+        log_path = log_path[:-3]
+    return log_path + '.idx'
+
+
+def read_summary(path):
+    # (lines, errors, warnings) from the footer alone, or None
+    try:
+        with open(path, 'rb') as f:
+            f.seek(-_FOOTER.size, os.SEEK_END)
+            magic, lines, errors, warnings = _FOOTER.unpack(f.read(_FOOTER.size))
+    except (OSError, struct.error):
+        return None
+    if magic != FOOTER_MAGIC:
+        return None
+    return lines, errors, warnings
+
+
+class LogIndexWriter:
+    """Writes the sidecar index of a log from the bytes appended to it.
+
+    Complete lines are classified and appended as one block per feed();
+    a trailing partial line waits for the next feed() or close(). I/O errors
+    disable the index instead of raising, like the log writer itself.
+    """
+
+    def __init__(self, path, classifier, encoding='utf-8'):
+        self.path = path
+        self.classifier = classifier
+        self.encoding = encoding
+        self.tags = list(classifier.tags)
+        self._codes = {tag: code for code, tag in enumerate(self.tags, 1)}
+        self.line_count = 0
+        self.errors = 0
+        self.warnings = 0
+        self._partial = b''
+        self._file = None
+        try:
+            self._file = open(path, 'wb', buffering=64 * 1024)
+            names = '\t'.join(self.tags).encode('utf-8')
+            self._file.write(MAGIC + _LENGTH.pack(len(names)) + names)
+        except OSError:
+            self._fail()
+
+    def feed(self, data):
+        if self._file is None:
+            return
+        cut = data.rfind(b'\n') + 1
+        if not cut:
+            self._partial += data
+            return
+        chunk = self._partial + data[:cut]
+        self._partial = data[cut:]
+        self._add(chunk.split(b'\n')[:-1], 1)
+
+    def _add(self, raw_lines, newline):
+        # Lengths come from the bytes; UTF-8 never hides a '\n' inside a character,
+        # so the decoded text splits into the same lines
+        lengths = array('I', map(operator.add, map(len, raw_lines), itertools.repeat(newline)))
+        text = b'\n'.join(raw_lines).decode(self.encoding, errors='replace')
+        tags = self.classifier.classify_batch(text.split('\n'))
+        codes = bytes([self._codes.get(tag, 0) for tag in tags])
+        self.line_count += len(raw_lines)
+        if 'error' in self._codes:
+            self.errors += codes.count(self._codes['error'])
+        if 'warning' in self._codes:
+            self.warnings += codes.count(self._codes['warning'])
+        try:
+            self._file.write(_BLOCK.pack(len(raw_lines)) + lengths.tobytes() + codes)
+        except (OSError, ValueError):
+            self._fail()
+
+    def flush(self):
+        if self._file:
+            try:
+                self._file.flush()
+            except OSError:
+                self._fail()
+
+    def close(self):
+        if self._file is None:
+            return
+        if self._partial:
+            self._add([self._partial], 0)
+            self._partial = b''
+        if self._file is None:
+            return
+        try:
+            self._file.write(_FOOTER.pack(FOOTER_MAGIC, self.line_count, self.errors, self.warnings))
+            self._file.close()
+        except OSError:
+            self._fail()
+        self._file = None
+
+    def _fail(self):
+        # Drop the file: a partial index would only be ignored by readers
+        if self._file:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        self._file = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class LogIndex:
+    """Line offsets and tags of a log, loaded from its sidecar index."""
+
+    def __init__(self, lengths, codes, tags, errors=0, warnings=0):
+        self.lengths = lengths
+        self.codes = codes
+        self.tags = [None] + list(tags) # Indexed by code
+        self.errors = errors
+        self.warnings = warnings
+
+    @classmethod
+    def load(cls, path):
+        # None if the index is missing, incomplete or unreadable
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(MAGIC) or len(data) < len(MAGIC) + _LENGTH.size + _FOOTER.size:
+            return None
+        magic, lines, errors, warnings = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+        if magic != FOOTER_MAGIC:
+            return None
+
+        pos = len(MAGIC)
+        (names_len,) = _LENGTH.unpack_from(data, pos)
+        pos += _LENGTH.size
+        names = data[pos:pos + names_len].decode('utf-8')
+        pos += names_len
+
+        lengths = array('I')
+        codes = bytearray()
+        end = len(data) - _FOOTER.size
+        try:
+            while pos < end:
+                (n,) = _BLOCK.unpack_from(data, pos)
+                pos += _BLOCK.size
+                lengths.frombytes(data[pos:pos + 4 * n])
+                pos += 4 * n
+                codes += data[pos:pos + n]
+                pos += n
+        except (struct.error, ValueError):
+            return None
+        if pos != end or len(lengths) != lines or len(codes) != lines:
+            return None
+        return cls(lengths, bytes(codes), names.split('\t') if names else [], errors, warnings)
+
+    @classmethod
+    def build(cls, paged_log, classifier, page_lines=50000):
+        # For logs without a sidecar (older runs): classify the whole log once
+        offsets = paged_log.offsets
+        lengths = array('I', map(operator.sub, offsets[1:], offsets[:-1]))
+        tags = classifier.tags
+        codes_by_tag = {tag: code for code, tag in enumerate(tags, 1)}
+        codes = bytearray()
+        for start in range(0, paged_log.line_count, page_lines):
+            line_tags = classifier.classify_batch(paged_log.lines(start, start + page_lines))
+            codes += bytes([codes_by_tag.get(tag, 0) for tag in line_tags])
+        index = cls(lengths, bytes(codes), tags)
+        index.errors = index.count('error')
+        index.warnings = index.count('warning')
+        return index
+
+    @property
+    def line_count(self):
+        return len(self.lengths)
+
+    def count(self, tag):
+        code = self._code(tag)
+        return self.codes.count(code) if code is not None else 0
+
+    def offsets(self):
+        # Start of every line plus the end of the last one, as PagedLog uses them
+        return array('Q', itertools.accumulate(self.lengths, initial=0))
+
+    def line_tags(self, start, end):
+        tags = self.tags
+        return [tags[code] if code < len(tags) else None for code in self.codes[start:end]]
+
+    def _code(self, tag):
+        try:
+            return self.tags.index(tag, 1)
+        except ValueError:
+            return None
+
+    def next_line(self, tag, after):
+        # First line after `after` carrying tag, or None
+        code = self._code(tag)
+        if code is None:
+            return None
+        found = self.codes.find(bytes([code]), max(0, after + 1))
+        return found if found >= 0 else None
+
+    def prev_line(self, tag, before):
+        code = self._code(tag)
+        if code is None or before <= 0:
+            return None
+        found = self.codes.rfind(bytes([code]), 0, before)
+        return found if found >= 0 else None
@@ -0,0 +1,223 @@
+import gzip
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .log_index import LogIndex, index_path, read_summary
+from .paged_log import PagedLog
+
+LOG_SUFFIXES = ('.log', '.log.gz')
+# <run>[_partN].log[.gz], where <run> is the run's timestamp, plus _2, _3... for runs started in the same second
+_LOG_NAME = re.compile(r'(?P<run>.+?)(?:_part(?P<part>\d+))?\.log(?:\.gz)?$')
+
+
+def log_run(filename):
+    # (run, part number) of a log file name; the first part of a run is part 0
+    m = _LOG_NAME.match(filename)
+    if not m:
+        return filename, 0
+    return m.group('run'), int(m.group('part') or 0)
+
+
+class LogStore:
+    """Run logs under logs/<script>/: listing, transparent reading, compression and retention.
+
+    Finished logs are gzip-compressed on a background thread. Retention keeps
+    at most keep_count runs per script, at most max_total_bytes on disk per
+    script and nothing older than max_age_days (0 disables a limit). A log's
+    sidecar index (<name>.log.idx) stays uncompressed and is removed with it.
+    Retention counts runs: a run's size-rotated parts (_partN) are kept or
+    removed together. Runs with a log in use - still being written (held from
+    creation until finalize()) or opened with open_paged() - are neither
+    compressed nor removed, and don't count towards the limits either.
+    """
+
+    def __init__(self, logs_dir, keep_count=10, max_total_bytes=0, max_age_days=0, compress=True):
+        self.logs_dir = logs_dir
+        self.keep_count = keep_count
+        self.max_total_bytes = max_total_bytes
+        self.max_age_days = max_age_days
+        self.compress_logs = compress
+        # One worker: compressing is I/O heavy and runs finish rarely enough
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='log-store')
+        self._in_use = {} # path -> holders; runs of one script may overlap in its folder
+        self._in_use_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, logs_dir, settings):
+        return cls(
+            logs_dir,
+            keep_count=settings['log_keep_count'],
+            max_total_bytes=settings['log_max_total_bytes'],
+            max_age_days=settings['log_max_age_days'],
+            compress=settings['log_compress'],
+        )
+
+    def script_dir(self, script_name):
+        # Scripts in subfolders ('tools/build.py') get nested log folders
+        return os.path.join(self.logs_dir, *script_name.split('/'))
+
+    def scripts(self):
+        # Names of all scripts with stored logs, sorted
+        names = []
+        for dirpath, dirnames, filenames in os.walk(self.logs_dir):
+            if any(f.endswith(LOG_SUFFIXES) for f in filenames):
+                names.append(os.path.relpath(dirpath, self.logs_dir).replace(os.sep, '/'))
+        names.sort()
+        return names
+
+    def list_logs(self, script_name):
+        # Newest run first (names start with the run timestamp), each run's parts in order
+        log_dir = self.script_dir(script_name)
+        try:
+            files = [f for f in os.listdir(log_dir) if f.endswith(LOG_SUFFIXES)]
+        except OSError:
+            return []
+        files.sort(key=lambda f: log_run(f)[1])
+        files.sort(key=lambda f: log_run(f)[0], reverse=True) # Stable: parts stay in order
+        return files
+
+    def resolve(self, script_name, filename):
+        # A log may have been compressed since it was listed
+        path = os.path.join(self.script_dir(script_name), filename)
+        if os.path.exists(path):
+            return path
+        if not filename.endswith('.gz') and os.path.exists(path + '.gz'):
+            return path + '.gz'
+        return None
+
+    def load_index(self, path):
+        return LogIndex.load(index_path(path))
+
+    def read_summary(self, script_name, filename):
+        # (lines, errors, warnings) of a finished log, or None if it has no index
+        return read_summary(index_path(os.path.join(self.script_dir(script_name), filename)))
+
+    def open_paged(self, path, offsets=None):
+        # A PagedLog holding the log until it is closed: on Windows a mapped file can't be removed
+        self.hold(path)
+        try:
+            return PagedLog(path, offsets=offsets, on_close=lambda: self.release(path))
+        except Exception:
+            self.release(path)
+            raise
+
+    def open_binary(self, path):
+        return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+    def read_bytes(self, script_name, filename):
+        path = self.resolve(script_name, filename)
+        if path is None:
+            return b''
+        with self.open_binary(path) as f:
+            return f.read()
+
+    def read(self, script_name, filename):
+        return self.read_bytes(script_name, filename).decode('utf-8', errors='ignore')
+
+    def hold(self, path):
+        # Marks a log as in use; RotatingLogWriter calls it for every file it opens
+        with self._in_use_lock:
+            self._in_use[path] = self._in_use.get(path, 0) + 1
+
+    def release(self, *paths):
+        with self._in_use_lock:
+            for path in paths:
+                holders = self._in_use.get(path, 0) - 1
+                if holders > 0:
+                    self._in_use[path] = holders
+                else:
+                    self._in_use.pop(path, None)
+
+    def in_use(self, path):
+        with self._in_use_lock:
+            return path in self._in_use
+
+    def finalize(self, script_name, paths):
+        # Compress a finished run's files and apply retention, in the background
+        return self._executor.submit(self._finalize, script_name, list(paths))
+
+    def _finalize(self, script_name, paths):
+        self.release(*paths)
+        if self.compress_logs:
+            # This run's logs, and any an earlier finalize had to leave uncompressed
+            log_dir = self.script_dir(script_name)
+            for filename in self.list_logs(script_name):
+                path = os.path.join(log_dir, filename)
+                if filename.endswith('.log') and not self.in_use(path):
+                    try:
+                        self.compress(path)
+                    except OSError:
+                        pass # Leave it uncompressed until the next run finishes
+        self.apply_retention(script_name, keep=paths)
+
+    def compress(self, path):
+        # Stream into a temp file, then swap it in so readers never see a partial .gz
+        tmp_path = path + '.gz.tmp'
+        try:
+            with open(path, 'rb') as src, gzip.open(tmp_path, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            shutil.copystat(path, tmp_path) # Keep the mtime for age-based retention
+        except OSError:
+            _remove(tmp_path)
+            raise
+        os.replace(tmp_path, path + '.gz')
+        try:
+            os.remove(path)
+        except OSError:
+            # Still open elsewhere (Windows): keep the plain log alone so the run isn't listed twice
+            _remove(path + '.gz')
+            raise
+        return path + '.gz'
+
+    def apply_retention(self, script_name, keep=()):
+        # keep: paths of the run being finalized, which is never removed
+        log_dir = self.script_dir(script_name)
+        kept_runs = {log_run(os.path.basename(path))[0] for path in keep}
+        runs = {} # run -> [paths, bytes, newest mtime]
+        busy = set() # Runs with a part still being written or read, possibly older than ones that finished
+        for filename in self.list_logs(script_name):
+            run = log_run(filename)[0]
+            path = os.path.join(log_dir, filename)
+            if self.in_use(path):
+                busy.add(run)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            size = st.st_size
+            try:
+                size += os.path.getsize(index_path(path))
+            except OSError:
+                pass
+            entry = runs.setdefault(run, [[], 0, 0])
+            entry[0].append(path)
+            entry[1] += size
+            entry[2] = max(entry[2], st.st_mtime)
+        entries = sorted((entry for run, entry in runs.items() if run not in busy),
+                         key=lambda entry: entry[2], reverse=True) # Newest first
+
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days else None
+        total = 0
+        for i, (paths, size, mtime) in enumerate(entries):
+            total += size
+            # The newest run is always kept
+            expired = i > 0 and (
+                (self.keep_count and i >= self.keep_count)
+                or (self.max_total_bytes and total > self.max_total_bytes)
+                or (cutoff is not None and mtime < cutoff)
+            )
+            if expired and log_run(os.path.basename(paths[0]))[0] not in kept_runs:
+                for path in paths:
+                    _remove(path)
+                    _remove(index_path(path))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,287 @@
+import os
+import queue
+import threading
+import time
+
+from .log_index import LogIndexWriter, index_path
+
+_CLOSE = object()
+
+
+class RotatingLogWriter:
+    """Buffered log file that rotates by size: <stem>.log, <stem>_part1.log, ...
+
+    Sizes are tracked from the bytes written, so rotating never touches the
+    filesystem beyond opening the next part. Writes that fail are counted in
+    dropped_bytes instead of raising, so logging can never kill a run.
+    With a classifier, every part also gets a sidecar index (see log_index).
+    on_open(path) is called for every part once its file exists.
+    """
+
+    def __init__(self, log_dir, stem, max_bytes=10 * 1024 * 1024, buffer_size=64 * 1024, encoding='utf-8', classifier=None,
+                 on_open=None):
+        self.log_dir = log_dir
+        self.stem = stem
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+        self.encoding = encoding
+        self.classifier = classifier
+        self.on_open = on_open
+        self.paths = []
+        self.part = 0
+        self.bytes_written = 0 # In the current part
+        self.total_bytes = 0
+        self.dropped_bytes = 0
+        self._file = None
+        self._index = None
+        self._lock = threading.Lock() # stdout and stderr readers share one writer
+
+    @classmethod
+    def create(cls, log_dir, stem, **kwargs):
+        # Exclusively create <stem>.log, adding _2, _3... if a concurrent run got there first
+        os.makedirs(log_dir, exist_ok=True)
+        for attempt in range(1, 100):
+            name = stem if attempt == 1 else f"{stem}_{attempt}"
+            path = os.path.join(log_dir, f"{name}.log")
+            if os.path.exists(path + '.gz'):
+                continue # Taken by a run whose log was already compressed
+            writer = cls(log_dir, name, **kwargs)
+            try:
+                writer._open(path, 'xb')
+                return writer
+            except FileExistsError:
+                continue
+        raise FileExistsError(f"No free log file name for {stem} in {log_dir}")
+
+    @property
+    def path(self):
+        return self.paths[0] if self.paths else None
+
+    def _open(self, path, mode='wb'):
+        self._file = open(path, mode, buffering=self.buffer_size)
+        self.paths.append(path)
+        if self.on_open:
+            self.on_open(path)
+        self.bytes_written = 0
+        if self.classifier is not None:
+            self._index = LogIndexWriter(index_path(path), self.classifier, self.encoding)
+
+    def _rotate(self):
+        self._close_file()
+        self.part += 1
+        self.bytes_written = 0
+        try:
+            self._open(os.path.join(self.log_dir, f"{self.stem}_part{self.part}.log"))
+        except OSError:
+            self._file = None # Later writes are counted as dropped
+
+    def _close_file(self):
+        if self._file:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+        if self._index:
+            self._index.close()
+            self._index = None
+
+    def _write(self, data):
+        if self._file is None:
+            self.dropped_bytes += len(data)
+            return
+        try:
+            self._file.write(data)
+            self.bytes_written += len(data)
+            self.total_bytes += len(data)
+        except (OSError, ValueError):
+            self.dropped_bytes += len(data)
+            return
+        if self._index:
+            self._index.feed(data)
+
+    def write(self, text):
+        data = text.encode(self.encoding, errors='replace') if isinstance(text, str) else text
+        with self._lock:
+            # A write may span many parts (the async writer joins queued chunks into one)
+            while self.max_bytes and self._file and self.bytes_written + len(data) > self.max_bytes:
+                room = self.max_bytes - self.bytes_written
+                # Fill the part up to the last line that fits, so parts split on line boundaries.
+                # A line longer than a whole part is cut, between characters where possible.
+                cut = data.rfind(b'\n', 0, room) + 1
+                if not cut and not self.bytes_written:
+                    cut = room
+                    while cut > 1 and data[cut] & 0xC0 == 0x80:
+                        cut -= 1
+                if cut:
+                    self._write(data[:cut])
+                    data = data[cut:]
+                self._rotate()
+            if data:
+                self._write(data)
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                try:
+                    self._file.flush()
+                except OSError:
+                    pass
+            if self._index:
+                self._index.flush()
+
+    def sync(self):
+        # Flush and fsync the current part
+        with self._lock:
+            if self._file:
+                try:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                except OSError:
+                    pass
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+
+
+class AsyncLogHandle:
+    """A log file written by AsyncLogWriter; write() never blocks on disk.
+
+    Once more than the service's max_pending_bytes are queued for it (or the
+    queue is full), it is backlogged and whoever feeds it should wait() before
+    producing more.
+    """
+
+    def __init__(self, service, writer):
+        self.service = service
+        self.writer = writer
+        self.pending_bytes = 0 # Queued, not written yet
+        self.queue_dropped_bytes = 0 # Dropped because the writer queue was full
+        self._closed = threading.Event()
+
+    @property
+    def path(self):
+        return self.writer.path
+
+    @property
+    def paths(self):
+        return self.writer.paths
+
+    @property
+    def dropped_bytes(self):
+        return self.writer.dropped_bytes + self.queue_dropped_bytes
+
+    @property
+    def backlogged(self):
+        return self.pending_bytes >= self.service.max_pending_bytes or self.service._queue.full()
+
+    def write(self, text):
+        try:
+            self.service._queue.put_nowait((self, text))
+        except queue.Full:
+            self.queue_dropped_bytes += len(text)
+            return
+        with self.service._written:
+            self.pending_bytes += len(text)
+
+    def wait(self, timeout=None):
+        # Blocks until the writer has caught up with this log; False if it timed out
+        service = self.service
+        with service._written:
+            return service._written.wait_for(lambda: not self.backlogged, timeout)
+
+    def close(self, timeout=None):
+        # Waits until everything queued before it is on disk
+        self.service._queue.put((self, _CLOSE))
+        self._closed.wait(timeout)
+
+
+class AsyncLogWriter:
+    """One background thread doing all log I/O, so pipe readers never wait on disk.
+
+    Writes go through a bounded queue and are batched per file. Writing never
+    blocks: a log with more than max_pending_bytes queued is backlogged (see
+    AsyncLogHandle.wait), and a full queue drops and counts bytes. fsync policy:
+    'none' leaves it to the OS, 'close' syncs when a log is closed, 'periodic'
+    also syncs open logs every fsync_interval seconds.
+    """
+
+    def __init__(self, max_queue=16384, max_pending_bytes=8 * 1024 * 1024, fsync='none', fsync_interval=5.0,
+                 flush_interval=1.0):
+        if fsync not in ('none', 'close', 'periodic'):
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.max_pending_bytes = max_pending_bytes
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(max_queue)
+        self._written = threading.Condition() # Notified as pending_bytes go down
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def open(self, log_dir, stem, **kwargs):
+        # Creating the file is synchronous so errors reach the caller
+        handle = AsyncLogHandle(self, RotatingLogWriter.create(log_dir, stem, **kwargs))
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+                self._thread.start()
+        return handle
+
+    def _run(self):
+        dirty = set() # Written since the last flush
+        unsynced = set() # Written since the last fsync ('periodic' policy)
+        last_flush = last_sync = time.monotonic()
+        while True:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+                while len(batch) < 1024:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            # Join consecutive chunks per file into one write
+            pending = {}
+            written = {} # handle -> size written from this batch
+            for handle, data in batch:
+                if data is _CLOSE:
+                    chunks = pending.pop(handle, None)
+                    if chunks:
+                        text = ''.join(chunks)
+                        handle.writer.write(text)
+                        written[handle] = written.get(handle, 0) + len(text)
+                    if self.fsync != 'none':
+                        handle.writer.sync()
+                    handle.writer.close()
+                    dirty.discard(handle)
+                    unsynced.discard(handle)
+                    handle._closed.set()
+                else:
+                    pending.setdefault(handle, []).append(data)
+            for handle, chunks in pending.items():
+                text = ''.join(chunks)
+                handle.writer.write(text)
+                written[handle] = written.get(handle, 0) + len(text)
+                dirty.add(handle)
+                if self.fsync == 'periodic':
+                    unsynced.add(handle)
+            if written:
+                with self._written:
+                    for handle, size in written.items():
+                        handle.pending_bytes -= size
+                    self._written.notify_all()
+
+            # Make running logs readable (History, tail) without flushing on every chunk
+            now = time.monotonic()
+            if dirty and now - last_flush >= self.flush_interval:
+                for handle in dirty:
+                    handle.writer.flush()
+                dirty.clear()
+                last_flush = now
+            if unsynced and now - last_sync >= self.fsync_interval:
+                for handle in unsynced:
+                    handle.writer.sync()
+                unsynced.clear()
+                last_sync = now
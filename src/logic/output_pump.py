@@ -0,0 +1,102 @@
+import queue
+import threading
+import time
+
+_CLOSE = object()
+
+
+class OutputPump:
+    """Moves items from worker threads to a sink on the Tk thread.
+
+    Nothing polls: put() schedules a drain only when the pump is idle, and each
+    drain stops after a fixed time budget so a flood of output can't starve
+    repaints and input. Once the queue is empty the pump sleeps until the next put().
+    With size_of(item), a sink call also gets at most max_size worth of items,
+    so a few huge items can't blow the budget in one call.
+    """
+
+    def __init__(self, root, sink, on_close=None, budget=0.008, frame_ms=16, size_of=None, max_size=64 * 1024):
+        self.root = root
+        self.sink = sink # sink(items, final) - called on the Tk thread
+        self.on_close = on_close
+        self.budget = budget
+        self.frame_ms = frame_ms
+        self.size_of = size_of
+        self.max_size = max_size
+        self.batch_size = 64 # Adapted to the measured cost of the sink
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def put(self, item):
+        # Safe to call from any thread
+        self._queue.put(item)
+        self._wake()
+
+    def close(self):
+        # Everything put before close() is delivered, then on_close runs on the Tk thread
+        self._queue.put(_CLOSE)
+        self._wake()
+
+    def _wake(self):
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        # Wait one frame so a burst of small reads is coalesced into one batch
+        self._schedule(self.frame_ms)
+
+    def _schedule(self, delay):
+        try:
+            self.root.after(delay, self._drain)
+        except Exception:
+            pass # Root destroyed while a reader was still running
+
+    def _take(self, limit):
+        items = []
+        size = 0
+        try:
+            while len(items) < limit:
+                item = self._queue.get_nowait()
+                if item is _CLOSE:
+                    return items, True
+                items.append(item)
+                if self.size_of:
+                    size += self.size_of(item)
+                    if size >= self.max_size:
+                        break
+        except queue.Empty:
+            pass
+        return items, False
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.budget
+        while True:
+            started = time.perf_counter()
+            items, closed = self._take(self.batch_size)
+            if items or closed:
+                try:
+                    self.sink(items, closed)
+                except Exception as e:
+                    print(f"Error in output pump: {e}")
+
+            if closed:
+                if self.on_close:
+                    self.on_close()
+                return
+
+            if items:
+                # Size the next batch to take about half the frame budget
+                per_item = (time.perf_counter() - started) / len(items)
+                if per_item > 0:
+                    self.batch_size = max(16, min(4096, int(self.budget / 2 / per_item)))
+
+            if not items or time.perf_counter() >= deadline:
+                break
+
+        with self._lock:
+            if self._queue.empty():
+                self._scheduled = False
+                return
+        # Still flooded: yield to the event loop (repaint, input) and continue
+        self._schedule(1)
@@ -0,0 +1,119 @@
+import gzip
+import itertools
+import mmap
+import operator
+import shutil
+import tempfile
+from array import array
+
+_INDEX_CHUNK = 8 * 1024 * 1024
+
+
+class PagedLog:
+    """Random access to the lines of a log file without loading it.
+
+    The file is memory-mapped and a line-offset index is built once, on first
+    use, so any range of lines can be decoded on demand. Compressed logs are
+    first decompressed into an anonymous temp file, which is mapped the same way.
+    on_close() is called once, by the first close().
+    """
+
+    def __init__(self, path, encoding='utf-8', offsets=None, on_close=None):
+        self.path = path
+        self.encoding = encoding
+        self.on_close = on_close
+        self._file = None
+        self._data = b''
+        if path.endswith('.gz'):
+            self._file = tempfile.TemporaryFile()
+            with gzip.open(path, 'rb') as src:
+                shutil.copyfileobj(src, self._file, 1024 * 1024)
+            self._file.flush()
+        else:
+            self._file = open(path, 'rb')
+        try:
+            # Zero-length files can't be mapped
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            pass
+        # Offsets from a sidecar index are used as long as they cover the whole file
+        self._offsets = None
+        if offsets is not None and len(offsets) and offsets[-1] == len(self._data):
+            self._offsets = offsets
+
+    def _build_index(self):
+        # offsets[i] is where line i starts; the last entry is the end of the data
+        data = self._data
+        size = len(data)
+        offsets = array('Q', [0])
+        base = 0
+        while base < size:
+            chunk = data[base:base + _INDEX_CHUNK]
+            parts = chunk.split(b'\n')
+            # Every part but the last ends with a newline inside this chunk
+            starts = itertools.accumulate(
+                map(operator.add, map(len, parts[:-1]), itertools.repeat(1)), initial=base)
+            next(starts)
+            offsets.extend(starts)
+            base += len(chunk)
+        if offsets[-1] != size:
+            offsets.append(size) # Last line has no trailing newline
+        return offsets
+
+    @property
+    def offsets(self):
+        if self._offsets is None:
+            self._offsets = self._build_index()
+        return self._offsets
+
+    @property
+    def line_count(self):
+        return len(self.offsets) - 1
+
+    @property
+    def size(self):
+        return len(self._data)
+
+    @property
+    def data(self):
+        # The raw bytes (an mmap), e.g. for bytes regexes
+        return self._data
+
+    def line_bytes(self, start, end):
+        start = max(0, min(start, self.line_count))
+        end = max(start, min(end, self.line_count))
+        offsets = self.offsets
+        return self._data[offsets[start]:offsets[end]]
+
+    def lines(self, start, end):
+        # Lines [start, end) with their line endings. Split on '\n' only so the
+        # result always lines up with the index (str.splitlines also splits on '\r' etc.)
+        parts = self.line_bytes(start, end).decode(self.encoding, errors='replace').split('\n')
+        lines = [part + '\n' for part in parts[:-1]]
+        if parts[-1]:
+            lines.append(parts[-1])
+        return lines
+
+    def blocks(self, lines_per_block=20000):
+        # (line, 0, text) pieces of the whole log, decoded one at a time
+        for start in range(0, self.line_count, lines_per_block):
+            text = self.line_bytes(start, start + lines_per_block).decode(self.encoding, errors='replace')
+            yield start, 0, text
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b''
+        self._offsets = array('Q', [0])
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self.on_close:
+            on_close, self.on_close = self.on_close, None
+            on_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
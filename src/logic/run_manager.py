@@ -0,0 +1,103 @@
+import collections
+import itertools
+import time
+
+_run_ids = itertools.count(1)
+
+
+class Run:
+    """One execution of a script: its process handle, log file and output view."""
+
+    def __init__(self, script_name, flags=None, label=None):
+        self.run_id = next(_run_ids)
+        self.script_name = script_name
+        self.flags = list(flags or [])
+        self.label = label or script_name
+        self.status = 'queued' # queued -> running -> finished / failed / aborted / cancelled
+        self.process = None
+        self.log_path = None
+        self.returncode = None
+        self.aborted = False
+        self.error_count = 0
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.view = None # Widget showing this run's output, owned by the UI
+
+    @property
+    def is_active(self):
+        return self.status in ('queued', 'running')
+
+    @property
+    def duration(self):
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class RunManager:
+    """Registry of runs with a concurrency limit; extra runs wait in a FIFO queue.
+
+    Not thread-safe: call everything from the UI thread. start_run(run) is
+    called whenever a slot frees up and must start the run asynchronously.
+    """
+
+    def __init__(self, start_run, max_concurrent=4, on_change=None):
+        self.start_run = start_run
+        self.max_concurrent = max_concurrent # 0 = unlimited
+        self.on_change = on_change
+        self.runs = {} # run_id -> Run, in submission order
+        self.pending = collections.deque()
+        self.active = {}
+
+    def submit(self, run):
+        self.runs[run.run_id] = run
+        self.pending.append(run)
+        self._start_pending()
+        self._changed()
+        return run
+
+    def finished(self, run, returncode):
+        run.returncode = returncode
+        run.finished_at = time.time()
+        if run.aborted:
+            run.status = 'aborted'
+        elif returncode == 0:
+            run.status = 'finished'
+        else:
+            run.status = 'failed'
+        self.active.pop(run.run_id, None)
+        self._start_pending()
+        self._changed()
+
+    def cancel(self, run):
+        # Only queued runs can be cancelled; running ones must be terminated
+        if run.status != 'queued':
+            return False
+        self.pending.remove(run)
+        run.status = 'cancelled'
+        run.finished_at = time.time()
+        self._changed()
+        return True
+
+    def remove(self, run):
+        if run.is_active:
+            return False
+        self.runs.pop(run.run_id, None)
+        self._changed()
+        return True
+
+    def running(self):
+        return list(self.active.values())
+
+    def _start_pending(self):
+        while self.pending and (not self.max_concurrent or len(self.active) < self.max_concurrent):
+            run = self.pending.popleft()
+            run.status = 'running'
+            run.started_at = time.time()
+            self.active[run.run_id] = run
+            self.start_run(run)
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
@@ -0,0 +1,443 @@
+import codecs
+import fnmatch
+import os
+import queue
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .classifier import LineClassifier
+from .log_store import LogStore
+from .log_writer import AsyncLogWriter
+from .script_cache import ScriptCache
+from .settings import load_settings
+
+CACHE_DIR = '.cache'
+LOG_WAIT_SECONDS = 5.0 # Longest a run's output waits for its backlogged log, before it is dropped from the log
+
+
+def _matches(path, patterns):
+    return any(fnmatch.fnmatch(path, pattern) for pattern in patterns)
+
+
+class ScriptRunner:
+    """Script discovery, execution and run logs, without any UI.
+
+    Runs report through callbacks that are called on the supervisor's thread;
+    a GUI hands them over to its event loop, the CLI just prints. They must not
+    block: every running script shares that thread.
+    """
+
+    def __init__(self, root_dir, settings=None):
+        self.root_dir = root_dir
+        self.logs_dir = os.path.join(root_dir, 'logs')
+        self.scripts = {} # Map name -> full path
+        self._stats = {} # Map name -> (mtime_ns, size) from the last scan
+        self._watch_stop = None
+        self.settings = settings if settings is not None else load_settings(root_dir)
+        self.scripts_dir = self._roots()[0][1] if self.settings['script_roots'] else os.path.join(root_dir, 'scripts')
+        self.classifier = LineClassifier.from_settings(self.settings)
+        self.log_store = LogStore.from_settings(self.logs_dir, self.settings)
+        self.log_service = AsyncLogWriter(fsync=self.settings['log_fsync'], fsync_interval=self.settings['log_fsync_interval'])
+        self._supervisor = None
+        self._supervisor_lock = threading.Lock()
+        self.script_cache = ScriptCache(os.path.join(root_dir, CACHE_DIR, 'scripts.json'))
+        self._parser = ThreadPoolExecutor(max_workers=8, thread_name_prefix='script-parse') # Header reads wait on I/O
+        # logs/ is created by the first run that writes a log
+
+    @property
+    def supervisor(self):
+        # Every run's child process lives on its event loop. Created with the first
+        # run: importing asyncio costs more than the rest of startup.
+        with self._supervisor_lock:
+            if self._supervisor is None:
+                from .supervisor import ProcessSupervisor
+                self._supervisor = ProcessSupervisor()
+            return self._supervisor
+
+    def _roots(self):
+        # (name prefix, folder) per configured root. Scripts of the first root are
+        # named by their path in it, so its flat scripts keep their names (and logs).
+        roots = []
+        for i, root in enumerate(self.settings['script_roots']):
+            path = os.path.normpath(os.path.join(self.root_dir, root))
+            roots.append(('' if i == 0 else os.path.basename(path) + '/', path))
+        return roots
+
+    def _walk(self):
+        """Yields (name, path, (mtime_ns, size)) for every script under the roots.
+
+        Folders are read depth-first in name order, a folder's scripts before its
+        subfolders. Names are '/' separated paths; the first root to provide a name wins.
+        """
+        include = self.settings['script_include']
+        exclude = self.settings['script_exclude']
+        seen = set()
+        for prefix, root in self._roots():
+            stack = [('', root)]
+            while stack:
+                rel_dir, directory = stack.pop()
+                try:
+                    # scandir hands back the stats without a call per file on Windows
+                    with os.scandir(directory) as it:
+                        entries = sorted(it, key=lambda entry: entry.name.lower())
+                except OSError:
+                    continue
+                subdirs = []
+                for entry in entries:
+                    rel = rel_dir + entry.name
+                    if _matches(rel, exclude):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False): # Linked folders could loop
+                            subdirs.append((rel + '/', entry.path))
+                        elif _matches(rel, include) and entry.is_file() and prefix + rel not in seen:
+                            seen.add(prefix + rel)
+                            st = entry.stat()
+                            yield prefix + rel, entry.path, (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+                stack.extend(reversed(subdirs))
+
+    def scan_scripts(self):
+        self.scripts, self._stats = self._scan()
+        return self.scripts
+
+    def _scan(self):
+        scripts = {}
+        stats = {} # name -> (mtime_ns, size)
+        for name, path, stat in self._walk():
+            scripts[name] = path
+            stats[name] = stat
+        return scripts, stats
+
+    def get_scripts_metadata(self):
+        if not self.scripts:
+            self.scan_scripts()
+        scripts = self.scripts
+
+        # Headers missing from the cache are parsed in parallel first
+        missing = [name for name in scripts if self.script_cache.get(scripts[name], self._stats.get(name)) is None]
+        list(self._parser.map(self.get_script_details, missing))
+
+        metadata = []
+        for filename, path in scripts.items():
+            display_name = self.format_script_name(filename)
+            description, flags = self.get_script_details(filename)
+            metadata.append((filename, display_name, description, flags))
+        self.script_cache.prune(scripts.values())
+        self.script_cache.save()
+        return metadata
+
+    def load_scripts(self, on_batch, on_done=None, batch_interval=0.1):
+        """Scans and parses every script on background threads, reporting as it goes.
+
+        on_batch(metadata) receives lists of (name, display_name, description, flags):
+        each script as soon as the walk reaches it - description None while its
+        header is still being parsed - and again once it is parsed. on_done() follows
+        the last batch. Both are called from a background thread.
+        """
+        thread = threading.Thread(target=self._load_scripts, args=(on_batch, on_done, batch_interval), name='script-scan', daemon=True)
+        thread.start()
+        return thread
+
+    def _load_scripts(self, on_batch, on_done, batch_interval):
+        scripts = {}
+        stats = {}
+        batch = []
+        parsed = queue.SimpleQueue()
+        pending = []
+        last_flush = time.monotonic()
+
+        def parse(name, path, stat):
+            description, flags = self._parse_details(name, path)
+            self.script_cache.put(path, stat, description, flags)
+            parsed.put((name, self.format_script_name(name), description, flags))
+
+        def flush():
+            nonlocal last_flush
+            # Copies are published: the UI thread may iterate them while the scan goes on
+            self.scripts, self._stats = dict(scripts), dict(stats)
+            try:
+                while True:
+                    batch.append(parsed.get_nowait())
+            except queue.Empty:
+                pass
+            if batch:
+                on_batch(list(batch))
+                batch.clear()
+            last_flush = time.monotonic()
+
+        for name, path, stat in self._walk():
+            scripts[name] = path
+            stats[name] = stat
+            cached = self.script_cache.get(path, stat)
+            if cached:
+                batch.append((name, self.format_script_name(name)) + cached)
+            else:
+                batch.append((name, self.format_script_name(name), None, []))
+                pending.append(self._parser.submit(parse, name, path, stat))
+            if time.monotonic() - last_flush >= batch_interval:
+                flush()
+        flush()
+
+        for _ in as_completed(pending):
+            if time.monotonic() - last_flush >= batch_interval:
+                flush()
+        flush()
+
+        self.script_cache.prune(scripts.values())
+        self.script_cache.save()
+        if on_done:
+            on_done()
+
+    def refresh_scripts(self):
+        """Rescans the script folders; True if any script was added, removed or modified.
+
+        Only scripts whose mtime or size changed are parsed again.
+        """
+        scripts, stats = self._scan()
+        if stats == self._stats:
+            return False
+        self.scripts, self._stats = scripts, stats
+        self.get_scripts_metadata() # Re-parses the changed ones and saves the cache
+        return True
+
+    def watch_scripts(self, on_change, interval):
+        # Poll the scripts folder every interval seconds on a daemon thread;
+        # on_change() is called from that thread after a change was picked up
+        if interval <= 0 or self._watch_stop is not None:
+            return
+        self._watch_stop = threading.Event()
+        threading.Thread(target=self._watch, args=(on_change, interval, self._watch_stop), name='script-watch', daemon=True).start()
+
+    def stop_watching(self):
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+    def _watch(self, on_change, interval, stop):
+        while not stop.wait(interval):
+            try:
+                changed = self.refresh_scripts()
+            except Exception as e:
+                print(f"Script rescan failed: {e}")
+                continue
+            if changed and not stop.is_set():
+                on_change()
+
+    def format_script_name(self, filename):
+        # Remove folders and extension
+        name = os.path.splitext(os.path.basename(filename))[0]
+        # Replace underscores with spaces
+        name = name.replace('_', ' ')
+        # Title Case
+        return name.title()
+
+    def get_script_details(self, script_name):
+        # Served from the cache while the file's mtime and size are unchanged
+        script_path = self.scripts.get(script_name)
+        if not script_path:
+            return "Unknown Script", []
+
+        stat = self._stats.get(script_name)
+        cached = self.script_cache.get(script_path, stat) if stat else None
+        if cached:
+            return cached
+
+        description, flags = self._parse_details(script_name, script_path)
+        if stat:
+            self.script_cache.put(script_path, stat, description, flags)
+        return description, flags
+
+    def _parse_details(self, script_name, script_path):
+        description = "Unknown Script"
+        flags = []
+        try:
+            with open(script_path, 'r', encoding='utf-8', errors='ignore') as f:
+                # Read first few lines
+                for _ in range(15):
+                    line = f.readline()
+                    if not line:
+                        break
+                    if "Description:" in line:
+                        description = line.split("Description:", 1)[1].strip()
+                    if "Flags:" in line:
+                        flags_str = line.split("Flags:", 1)[1].strip()
+                        flags = [f.strip() for f in flags_str.split(',') if f.strip()]
+        except Exception:
+            pass
+
+        if description == "Unknown Script":
+            # Fallback
+            ext = os.path.splitext(script_name)[1]
+            if ext == '.ps1':
+                description = "PowerShell Script"
+            elif ext == '.sh':
+                description = "Shell Script (Bash)"
+            elif ext == '.py':
+                description = "Python Script"
+            else:
+                description = "Executable Script"
+
+        return description, flags
+
+    def build_command(self, script_name, flags=None):
+        script_path = self.scripts.get(script_name)
+        # Determine command based on extension
+        if script_name.endswith('.ps1'):
+            cmd = ["powershell", "-ExecutionPolicy", "Bypass", "-File", script_path]
+        elif script_name.endswith('.sh'):
+            # Try to find Git Bash on Windows
+            git_bash_path = r"C:\Program Files\Git\bin\bash.exe"
+            if os.path.exists(git_bash_path):
+                cmd = [git_bash_path, script_path]
+            else:
+                # Fallback to system bash (might be WSL)
+                cmd = ["bash", script_path]
+        elif script_name.endswith('.py'):
+            cmd = ["python", "-u", script_path] # -u for unbuffered output
+        elif script_name.endswith('.bat'):
+            cmd = ["cmd.exe", "/c", script_path]
+        else:
+            cmd = [script_path]
+
+        # Append flags if any
+        if flags:
+            cmd.extend(flags)
+        return cmd
+
+    def start(self, run, on_output, on_finished=None, on_logs_finalized=None):
+        # Schedule the run on the supervisor loop; returns a concurrent Future of execute()'s result
+        return self.supervisor.submit(self._execute(run, on_output, on_finished, on_logs_finalized))
+
+    def execute(self, run, on_output, on_finished=None, on_logs_finalized=None):
+        """Runs a script to completion, blocking the calling thread, and returns its exit code.
+
+        on_output(text, tag) receives the output as it is read (on the supervisor
+        thread) followed by status messages; on_finished(run) is called after the
+        last of it. on_logs_finalized(script_name) follows once the log has been
+        compressed and retention applied. Returns None if the script didn't start.
+        """
+        return self.start(run, on_output, on_finished, on_logs_finalized).result()
+
+    async def _execute(self, run, on_output, on_finished, on_logs_finalized):
+        script_name = run.script_name
+        unfinalized = None # Log whose files are held until finalize()
+        try:
+            process = await self.supervisor.spawn(
+                self.build_command(script_name, run.flags),
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+            run.process = process
+            if run.aborted:
+                self._terminate(process) # Stopped while we were starting up
+
+            # Logging Setup
+            script_log_dir = self.log_store.script_dir(script_name)
+            timestamp = time.strftime('%Y-%m-%d_%H-%M-%S')
+            try:
+                # Writes are queued to the log writer thread; reading the pipes never waits on disk
+                # Every part is held until finalize(), so retention of overlapping runs leaves it alone
+                log_writer = self.log_service.open(script_log_dir, timestamp, max_bytes=self.settings['log_max_bytes'],
+                                                   classifier=self.classifier, on_open=self.log_store.hold)
+                run.log_path = log_writer.path
+                unfinalized = log_writer
+            except Exception as e:
+                on_output(f"Error opening log file: {e}\n", 'error')
+                log_writer = None
+
+            dropped_shown = 0 # Bytes dropped from the log, as last reported
+            dropped_at = 0.0
+
+            def emit(text):
+                nonlocal dropped_shown, dropped_at
+                if not text:
+                    return
+                # We might get partial lines or just prompts without newlines
+                # The UI append_log handles this fine as it just inserts text
+                on_output(text, None) # Don't blindly tag stderr as error, the content decides
+                if log_writer:
+                    log_writer.write(text)
+                    # Output missing from the log is reported while it happens, at most once a second
+                    dropped = log_writer.dropped_bytes
+                    if dropped != dropped_shown and time.monotonic() - dropped_at >= 1.0:
+                        dropped_shown, dropped_at = dropped, time.monotonic()
+                        on_output(f"Warning: {dropped} bytes could not be written to the log so far\n", 'warning')
+
+            async def read(stream):
+                # Incremental decoding keeps characters split across reads intact
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+                def on_data(data):
+                    emit(decoder.decode(data))
+                    if log_writer and log_writer.backlogged:
+                        # The disk can't keep up: stop reading until the log catches up, which
+                        # pauses the child on its pipe instead of dropping its output from the log
+                        return self.supervisor.run_blocking(log_writer.wait, LOG_WAIT_SECONDS)
+
+                await self.supervisor.pump(stream, on_data)
+                # A partial character left at EOF comes out as U+FFFD instead of vanishing
+                emit(decoder.decode(b'', final=True))
+
+            # Both pipes reach EOF and the process has exited before anything is reported as finished
+            await self.supervisor.gather(read(process.stdout), read(process.stderr))
+            returncode = await process.wait()
+            run.returncode = returncode
+
+            completion_msg = f"\nScript finished with code {returncode}\n"
+            on_output(completion_msg, 'info')
+
+            if log_writer:
+                await self.supervisor.run_blocking(log_writer.close) # Waits for the queued writes
+                if log_writer.dropped_bytes:
+                    on_output(f"Warning: {log_writer.dropped_bytes} bytes could not be written to the log\n", 'warning')
+                # Compress and apply retention in the background
+                future = self.log_store.finalize(script_name, log_writer.paths)
+                unfinalized = None
+                if on_logs_finalized:
+                    future.add_done_callback(lambda f: on_logs_finalized(script_name))
+            return returncode
+
+        except Exception as e:
+            on_output(f"Error running script: {str(e)}\n", 'error')
+            if unfinalized:
+                self.log_store.release(*unfinalized.paths)
+            return None
+        finally:
+            if on_finished:
+                on_finished(run)
+
+    @staticmethod
+    def _terminate(process):
+        if process.returncode is None:
+            try:
+                process.terminate() # Try nice termination first
+            except ProcessLookupError:
+                pass # Exited meanwhile
+
+    def abort(self, run):
+        # Terminate a run's process; True if there was one to stop.
+        # A run that hasn't spawned yet is terminated as soon as it does.
+        run.aborted = True
+        process = run.process
+        if process and process.returncode is None:
+            self.supervisor.call(self._terminate, process)
+            return True
+        return False
+
+    def send_input(self, run, text):
+        # Write a line to a run's stdin; False if it isn't running
+        process = run.process
+        if process and process.returncode is None and process.stdin:
+            self.supervisor.call(self._write_input, process, (text + "\r\n").encode('utf-8'))
+            return True
+        return False
+
+    @staticmethod
+    def _write_input(process, data):
+        try:
+            process.stdin.write(data) # Small, so the transport buffers it without a drain
+        except (ConnectionResetError, BrokenPipeError, RuntimeError):
+            pass # The script closed its stdin or exited
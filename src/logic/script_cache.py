@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+
+CACHE_VERSION = 1
+
+
+class ScriptCache:
+    """Parsed script headers, keyed by path and valid while mtime and size match.
+
+    Persisted as JSON between sessions so a warm start only stats the scripts.
+    The file is read on first use, on whichever thread needs it first.
+    Thread-safe; save() writes only when something changed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = None # path -> {'mtime': ns, 'size': bytes, 'description': str, 'flags': [str]}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock() # The UI and the watcher thread may both save
+
+    def _load(self):
+        # Called with the lock held
+        if self._entries is not None:
+            return
+        self._entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return # First run, or a damaged cache that is rebuilt from the scripts
+        if isinstance(data, dict) and data.get('version') == CACHE_VERSION and isinstance(data.get('scripts'), dict):
+            self._entries = data['scripts']
+
+    def get(self, path, stat):
+        # (description, flags) if the entry is still valid for this (mtime_ns, size)
+        with self._lock:
+            self._load()
+            entry = self._entries.get(path)
+        if entry and entry.get('mtime') == stat[0] and entry.get('size') == stat[1]:
+            return entry['description'], list(entry['flags'])
+        return None
+
+    def put(self, path, stat, description, flags):
+        with self._lock:
+            self._load()
+            self._entries[path] = {'mtime': stat[0], 'size': stat[1], 'description': description, 'flags': list(flags)}
+            self._dirty = True
+
+    def prune(self, paths):
+        # Forget scripts that are gone
+        with self._lock:
+            self._load()
+            for path in set(self._entries) - set(paths):
+                del self._entries[path]
+                self._dirty = True
+
+    def save(self):
+        with self._save_lock:
+            self._save()
+
+    def _save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'version': CACHE_VERSION, 'scripts': dict(self._entries)}
+            self._dirty = False
+        tmp_path = self.path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path) # Never leaves a half-written cache behind
+        except OSError as e:
+            print(f"Script cache not saved: {e}")
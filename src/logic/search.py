@@ -0,0 +1,107 @@
+import re
+import threading
+
+MAX_MATCHES = 200000 # Past this a search stops and reports a partial count
+_SLICE_CHARS = 1024 * 1024 # One regex call holds the GIL, so big texts are scanned in slices
+
+
+def compile_query(query, case_sensitive=False, use_regex=False, binary=False):
+    # Raises re.error for an invalid regex. Binary patterns search raw UTF-8 log
+    # bytes; their case folding only covers ASCII.
+    flags = 0 if case_sensitive else re.IGNORECASE
+    if binary:
+        query = query.encode('utf-8')
+    return re.compile(query if use_regex else re.escape(query), flags)
+
+
+def _slices(line, col, text):
+    # Cut text at newlines into pieces of about _SLICE_CHARS, tracking where each starts
+    start = 0
+    while start < len(text):
+        end = len(text)
+        if end - start > _SLICE_CHARS:
+            cut = text.rfind('\n', start, start + _SLICE_CHARS)
+            if cut > start:
+                end = cut + 1
+        yield line, col, text[start:end] # The whole text is not copied
+        line += text.count('\n', start, end)
+        col = 0 # Every slice after the first starts on a fresh line
+        start = end
+
+
+def find_matches(pattern, line, col, text):
+    # (line, col, length) of every non-empty match in text, which starts at line/col
+    line_start = -col # Index in text where the current line starts
+    pos = 0
+    for m in pattern.finditer(text):
+        start, end = m.span()
+        if start == end:
+            continue # Empty regex matches can't be highlighted
+        newlines = text.count('\n', pos, start)
+        if newlines:
+            line += newlines
+            line_start = text.rfind('\n', pos, start) + 1
+        pos = start
+        yield line, start - line_start, end - start
+
+
+class SearchJob:
+    """Finds every match of a pattern on a worker thread.
+
+    blocks is an iterable of (line, col, text) - text that starts at that
+    0-based line and column - and is consumed on the worker, so it may read
+    lazily from disk. Matches are (line, col, length) tuples in text order,
+    handed to on_results(matches, done) in chunks from the worker thread.
+    After cancel() nothing more is delivered.
+    """
+
+    def __init__(self, pattern, blocks, on_results, chunk_size=1000, max_matches=MAX_MATCHES):
+        self.pattern = pattern
+        self.blocks = blocks
+        self.on_results = on_results
+        self.chunk_size = chunk_size
+        self.max_matches = max_matches
+        self.count = 0
+        self.truncated = False
+        self._cancelled = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name='search', daemon=True).start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _deliver(self, matches, done):
+        if not self.cancelled:
+            self.on_results(matches, done)
+
+    def _run(self):
+        self._batch = []
+        try:
+            self._scan()
+        except Exception as e:
+            print(f"Search failed: {e}")
+        self.count += len(self._batch)
+        self._deliver(self._batch, True)
+
+    def _scan(self):
+        for block in self.blocks:
+            for piece in _slices(*block):
+                if self.cancelled:
+                    return
+                for match in find_matches(self.pattern, *piece):
+                    self._batch.append(match)
+                    if len(self._batch) >= self.chunk_size:
+                        self.count += len(self._batch)
+                        self._deliver(self._batch, False)
+                        self._batch = []
+                        if self.cancelled:
+                            return
+                        if self.count >= self.max_matches:
+                            self.truncated = True
+                            return
@@ -0,0 +1,66 @@
+import json
+import os
+
+# Defaults for everything tunable from settings.json in the project root.
+# Keys missing from the file fall back to these values.
+DEFAULTS = {
+    # Folders searched recursively for scripts, relative to the project root or absolute.
+    # Scripts of later folders are listed under the folder's name.
+    'script_roots': ['scripts'],
+    # Globs matched against a script's path inside its root ('/' separated, '*' crosses folders).
+    # Excluded folders are not entered.
+    'script_include': ['*.ps1', '*.sh', '*.bat', '*.py'],
+    'script_exclude': ['.*', '*/.*'],
+    # Console scrollback: oldest lines are evicted once either limit is hit (0 = unlimited).
+    # Bytes are counted as UTF-8.
+    'scrollback_lines': 100000,
+    'scrollback_bytes': 32 * 1024 * 1024,
+    # Extra severity rules: preset names ("maven", "gradle") or [tag, regex] pairs.
+    # Regexes are searched in the lowercased line.
+    'log_rules': [],
+    # Scripts allowed to run at the same time; further runs wait in a queue (0 = unlimited)
+    'max_concurrent_runs': 4,
+    # Run logs rotate into <timestamp>_partN.log files past this size
+    'log_max_bytes': 10 * 1024 * 1024,
+    # fsync policy for run logs: "none", "close" or "periodic" (every log_fsync_interval seconds)
+    'log_fsync': 'none',
+    'log_fsync_interval': 5.0,
+    # Finished logs are gzip-compressed; retention per script (0 = no limit)
+    'log_compress': True,
+    'log_keep_count': 10,
+    'log_max_total_bytes': 0,
+    'log_max_age_days': 0,
+    # Seconds between checks of the scripts folder for added, removed or edited scripts (0 = off)
+    'script_poll_interval': 5.0,
+    # Actuator inventory: {"AppName": {"region": "https://base-url", ...}, ...}.
+    # /actuator/info and /actuator/health are read from every base URL.
+    'actuator_endpoints': {},
+    # Seconds to wait for a connection or a response, and endpoints queried at the same time
+    'actuator_timeout': 5.0,
+    'actuator_workers': 200,
+    # Auto-refresh: seconds between polls of an endpoint that is UP (0 = manual refresh only).
+    # DOWN or unreachable endpoints wait twice as long after each poll, up to actuator_max_backoff.
+    # Delays vary by +/- actuator_jitter (a fraction) so regions aren't polled in lockstep.
+    'actuator_poll_interval': 30.0,
+    'actuator_max_backoff': 600.0,
+    'actuator_jitter': 0.2,
+    # SQLite file keeping every change of the actuator rows, for comparing with the past
+    # (relative to the project root or absolute, "" = no history)
+    'actuator_history': 'actuator_history.db',
+}
+
+SETTINGS_FILE = 'settings.json'
+
+
+def load_settings(root_dir):
+    settings = dict(DEFAULTS)
+    path = os.path.join(root_dir, SETTINGS_FILE)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                user_settings = json.load(f)
+            if isinstance(user_settings, dict):
+                settings.update(user_settings)
+        except Exception as e:
+            print(f"Settings not loaded: {e}")
+    return settings
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import sys
+import threading
+
+MIN_READ = 4 * 1024
+MAX_READ = 256 * 1024
+_PIPE_LIMIT = 1024 * 1024 # StreamReader buffering before the child is paused
+
+
+class ProcessSupervisor:
+    """One asyncio event loop on a daemon thread that owns every child process.
+
+    Each child costs a few coroutines instead of two OS threads, so dozens of
+    scripts can run at once. Coroutines are submitted from any thread with
+    submit(); call() runs a plain function on the loop, which is how other
+    threads must touch the asyncio process objects.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        with self._lock:
+            if self._loop is None:
+                # Started on first use: nothing runs until a script does
+                ready = threading.Event()
+                threading.Thread(target=self._run, args=(ready,), name='process-supervisor', daemon=True).start()
+                ready.wait()
+            return self._loop
+
+    def _run(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        if sys.version_info < (3, 12) and hasattr(os, 'pidfd_open'):
+            # The default watcher before 3.12 starts a waitpid thread per child;
+            # pidfds are polled by the loop itself (3.12+ picks them on its own)
+            watcher = asyncio.PidfdChildWatcher()
+            watcher.attach_loop(self._loop)
+            asyncio.get_event_loop_policy().set_child_watcher(watcher)
+        ready.set()
+        self._loop.run_forever()
+
+    def submit(self, coro):
+        # A concurrent.futures.Future with the coroutine's result
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, func, *args):
+        self.loop.call_soon_threadsafe(func, *args)
+
+    async def spawn(self, cmd, **kwargs):
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_PIPE_LIMIT,
+            **kwargs
+        )
+
+    @staticmethod
+    async def gather(*aws):
+        return await asyncio.gather(*aws)
+
+    @staticmethod
+    async def run_blocking(func, *args):
+        # Runs func on the default executor so it doesn't stall the other children
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    @staticmethod
+    async def pump(stream, on_data):
+        # Read until EOF, passing each chunk to on_data(bytes); if that returns an awaitable
+        # (a consumer that fell behind), it is awaited before reading on. The read size follows
+        # the output rate: it doubles while reads come back full and halves when they
+        # don't, so a chatty child is drained in few large reads and a quiet one in small ones.
+        size = MIN_READ
+        while True:
+            data = await stream.read(size)
+            if not data:
+                return
+            waiting = on_data(data)
+            if waiting is not None:
+                await waiting # Meanwhile the child blocks on its full pipe
+            if len(data) == size:
+                size = min(size * 2, MAX_READ)
+            elif len(data) < size // 4:
+                size = max(size // 2, MIN_READ)
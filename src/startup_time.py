@@ -0,0 +1,90 @@
+"""Measure how fast the Script Manager window comes up.
+
+    python startup_time.py [--runs 5] [--top 15] [--record startup_times.jsonl]
+
+Starts ui.py --startup-time under -X importtime a few times and reports the
+median wall clock from launch to the first paint of the window and to the first
+tab being ready, followed by the slowest imports. --record appends the result
+as a JSON line, so the numbers can be tracked across changes. Needs a display.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+UI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ui.py')
+
+
+def measure_once():
+    # (first_paint, ready, {module: cumulative_us}) of one launch, wall clock from before the spawn
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', UI_PATH, '--startup-time'],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    line = process.stdout.readline()
+    reported_at = time.perf_counter() - started
+    _, stderr = process.communicate(timeout=60)
+    if not line.startswith('startup '):
+        raise RuntimeError(f"ui.py did not report its startup time:\n{stderr[-2000:]}")
+
+    # Times in the line are counted from ui.py's first statement; shift them to the launch
+    values = dict(field.split('=') for field in line.split()[1:])
+    offset = reported_at - float(values['ready'])
+    return float(values['first_paint']) + offset, reported_at, parse_importtime(stderr)
+
+
+def parse_importtime(stderr):
+    # "import time: self [us] | cumulative | imported package" lines
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue # The header
+        imports[fields[2].strip()] = int(fields[1])
+    return imports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Script Manager startup time.")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help="slowest imports to list")
+    parser.add_argument('--record', help="append the result to this JSON lines file")
+    args = parser.parse_args(argv)
+
+    measure_once() # Warm the OS file cache and __pycache__
+    results = [measure_once() for _ in range(args.runs)]
+    first_paint = statistics.median(result[0] for result in results)
+    ready = statistics.median(result[1] for result in results)
+    imports = {module: statistics.median(result[2].get(module, 0) for result in results) for module in results[0][2]}
+    slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    print(f"first paint  {first_paint * 1000:7.1f} ms")
+    print(f"ready        {ready * 1000:7.1f} ms  (median of {args.runs})")
+    print("slowest imports (cumulative):")
+    for module, us in slowest:
+        print(f"  {us / 1000:7.1f} ms  {module}")
+
+    if args.record:
+        record = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'runs': args.runs,
+            'first_paint_ms': round(first_paint * 1000, 1),
+            'ready_ms': round(ready * 1000, 1),
+            'imports_ms': {module: round(us / 1000, 1) for module, us in slowest},
+        }
+        with open(args.record, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
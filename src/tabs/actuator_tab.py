@@ -1,10 +1,53 @@
 import tkinter as tk
 from tkinter import ttk
+import os
+import sys
+import time
+
+# Add src to path so we can import logic when run standalone
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic.actuator_client import PENDING, ActuatorClient, endpoints_from_settings
+from logic.actuator_drift import drift_view
+from logic.actuator_history import ActuatorHistory
+from logic.actuator_scheduler import ActuatorScheduler
+from logic.settings import load_settings
+
+# "Compare with" choices going back a fixed time
+COMPARE_AGES = {'1 hour ago': 3600, '1 day ago': 86400, '1 week ago': 7 * 86400}
+PREVIOUS_BUILD = 'Previous build'
 
 class ActuatorsTab(ttk.Frame):
     def __init__(self, parent, controller=None):
         super().__init__(parent)
+        self.rows = []
+        self.root_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        self.settings = load_settings(self.root_dir)
+        self.client = ActuatorClient.from_settings(self.settings)
+        self.fetch_job = None
+        self._endpoints = endpoints_from_settings(self.settings) # (app, region, base_url)
+        self._latest = {} # (app, region) -> last row answered, by a refresh or the scheduler
+        self._flush_pending = False
+        # Polls in the background; shares its per-endpoint state with manual refreshes,
+        # so both make conditional requests and agree on the last answer
+        self.scheduler = ActuatorScheduler.from_settings(
+            self.client, self._endpoints, lambda row: self._post(self._add_result, row), self.settings)
+        history_path = self.settings['actuator_history']
+        self.history = ActuatorHistory(os.path.join(self.root_dir, history_path)) if history_path else None
+        self._unrecorded = [] # Rows answered since the last hand-off to the history
+        self._baseline = None # (app, region) -> row the table is compared with
+        self._builds_app = None # App whose deploys are listed
+        self._shown = {} # Table iid -> row it shows, in table order
+        self._highlights = {} # Table iid -> time its change highlight ends
+        self._highlight_pending = False
+        self.highlight_ms = 2000
+        self._drift_regions = None # Region columns of the drift table
+        self._drift_shown = {} # Drift table iid (app) -> (values, tags), in table order
         self._setup_ui()
+        self.bind('<Destroy>', self._on_destroy, add='+')
+        self.refresh_actuators()
+        if self.auto_refresh.get():
+            self.scheduler.start()
 
     def _setup_ui(self):
         # Layout: Top buttons, Bottom Table
@@ -12,6 +55,40 @@ class ActuatorsTab(ttk.Frame):
         top_frame.pack(fill='x', padx=5, pady=5)
 
         ttk.Button(top_frame, text="Refresh Actuators", command=self._on_refresh_actuators).pack(side='left')
+        self.auto_refresh = tk.BooleanVar(value=self.settings['actuator_poll_interval'] > 0 and bool(self._endpoints))
+        ttk.Checkbutton(top_frame, text="Auto-refresh", variable=self.auto_refresh,
+                        command=self._on_auto_refresh_toggled).pack(side='left', padx=5)
+        # "Compare the same apps across regions": one row per app, one column per region
+        self.by_region = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="By region", variable=self.by_region, style='Toggle.TCheckbutton',
+                        command=self._on_view_changed).pack(side='left', padx=5)
+        self.only_drifted = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="Only drifted apps", variable=self.only_drifted,
+                        command=self._on_view_changed).pack(side='left', padx=5)
+        if self.history:
+            ttk.Label(top_frame, text="Compare with").pack(side='left', padx=(10, 2))
+            self.compare_with = ttk.Combobox(top_frame, state='readonly', width=14,
+                                             values=['Nothing', *COMPARE_AGES, PREVIOUS_BUILD])
+            self.compare_with.set('Nothing')
+            self.compare_with.bind('<<ComboboxSelected>>', self._on_compare_changed)
+            self.compare_with.pack(side='left')
+        self.status_label = ttk.Label(top_frame, text="")
+        self.status_label.pack(side='left', padx=10)
+
+        if self.history:
+            # Deploys of the app selected in either table, newest first
+            builds_frame = ttk.Frame(self)
+            builds_frame.pack(side='bottom', fill='x', padx=5, pady=5)
+            self.builds_label = ttk.Label(builds_frame, text="Select an app to see when each region got its builds")
+            self.builds_label.pack(anchor='w')
+            self.builds_tree = ttk.Treeview(builds_frame, columns=('time', 'region', 'version', 'branch', 'commit_id'),
+                                            show='headings', height=8)
+            self.builds_tree.heading('time', text='Seen At')
+            self.builds_tree.heading('region', text='Region')
+            self.builds_tree.heading('version', text='Version')
+            self.builds_tree.heading('branch', text='Branch')
+            self.builds_tree.heading('commit_id', text='Commit ID')
+            self.builds_tree.pack(fill='x')
 
         # Table
         columns = ('app_name', 'region', 'version', 'branch', 'commit_id', 'status')
@@ -24,30 +101,269 @@ class ActuatorsTab(ttk.Frame):
         self.actuator_tree.heading('commit_id', text='Commit ID')
         self.actuator_tree.heading('status', text='Status')
 
+        self.actuator_tree.tag_configure('changed', background='#4d4000')
+
         self.actuator_tree.pack(expand=True, fill='both', padx=5, pady=5)
 
+        # Drift table: columns are set from the regions seen (see _update_drift_table)
+        self.drift_tree = ttk.Treeview(self, columns=('app_name',), show='headings')
+        self.drift_tree.tag_configure('drifted', foreground='#ff9f43')
+
+        if self.history:
+            self.actuator_tree.bind('<<TreeviewSelect>>', self._on_app_selected)
+            self.drift_tree.bind('<<TreeviewSelect>>', self._on_app_selected)
+
     def _on_refresh_actuators(self):
         self.refresh_actuators()
 
-    def update_actuator_table(self, data):
-        # Clear existing
-        for item in self.actuator_tree.get_children():
-            self.actuator_tree.delete(item)
-        
-        for row in data:
-            self.actuator_tree.insert('', tk.END, values=row)
+    def _on_auto_refresh_toggled(self):
+        if self.auto_refresh.get() and self.settings['actuator_poll_interval'] > 0:
+            self.scheduler.start()
+        else:
+            self.auto_refresh.set(False) # Manual only when actuator_poll_interval is 0
+            self.scheduler.stop()
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self.scheduler.stop()
+            if self.fetch_job:
+                self.fetch_job.cancel()
+            if self.history:
+                self.history.close()
+            self.client.close()
+
+    def _post(self, func, *args):
+        # Runs func(*args) on the Tk thread; called from worker threads
+        try:
+            self.after(0, func, *args)
+        except Exception:
+            pass # Root destroyed
+
+    def _on_view_changed(self):
+        if self.by_region.get():
+            self.actuator_tree.pack_forget()
+            self.drift_tree.pack(expand=True, fill='both', padx=5, pady=5)
+            self._update_drift_table()
+        else:
+            self.drift_tree.pack_forget()
+            self.actuator_tree.pack(expand=True, fill='both', padx=5, pady=5)
+
+    def get_regions(self):
+        # Regions seen in the last refresh, used by the Scripts tab fan-out
+        return sorted({row[1] for row in self.rows})
+
+    @staticmethod
+    def _row_iid(row):
+        # Rows are keyed by (app, region), so they keep their identity across refreshes
+        return f"{row[0]}\t{row[1]}"
+
+    def update_actuator_table(self, data, highlight=True):
+        # Applies only the difference to the table: selection and scroll position
+        # survive, and rows that didn't change cost no Tcl calls
+        self.rows = list(data)
+        tree = self.actuator_tree
+        wanted = {self._row_iid(row): self._compared(row) for row in data}
+
+        stale = [iid for iid in self._shown if iid not in wanted]
+        if stale:
+            tree.delete(*stale)
+            for iid in stale:
+                self._highlights.pop(iid, None)
+
+        now = time.monotonic()
+        for index, (iid, row) in enumerate(wanted.items()):
+            old = self._shown.get(iid)
+            if old is None:
+                tree.insert('', index, iid=iid, values=row)
+            elif old != row:
+                if old[5] == PENDING or not highlight:
+                    tree.item(iid, values=row, tags=()) # First answer, or another comparison: nothing to highlight
+                else:
+                    # Changed cells are marked, and the row highlighted, for a moment
+                    changed = [f"● {new}" if new != before else new for before, new in zip(old, row)]
+                    tree.item(iid, values=changed, tags=('changed',))
+                    self._highlights[iid] = now + self.highlight_ms / 1000
+        if [iid for iid in self._shown if iid in wanted] != [iid for iid in wanted if iid in self._shown]:
+            for index, iid in enumerate(wanted):
+                tree.move(iid, '', index) # The inventory order changed
+        self._shown = wanted
+
+        if self._highlights and not self._highlight_pending:
+            self._highlight_pending = True
+            self.after(self.highlight_ms, self._clear_highlights)
+
+        if self.by_region.get():
+            self._update_drift_table()
+
+    def _update_drift_table(self):
+        # Pivot of self.rows; like the row table, only the difference reaches Tk
+        regions, apps = drift_view(self.rows, self.only_drifted.get())
+        tree = self.drift_tree
+        if regions != self._drift_regions:
+            # Region columns changed: rebuild the table
+            if self._drift_shown:
+                tree.delete(*self._drift_shown)
+            self._drift_shown = {}
+            self._drift_regions = regions
+            tree.configure(columns=['app_name'] + [f"region{i}" for i in range(len(regions))])
+            tree.heading('app_name', text='App Name')
+            for i, region in enumerate(regions):
+                tree.heading(f"region{i}", text=region)
+
+        wanted = {}
+        for app in apps:
+            # Regions not running the app's most common build are marked
+            cells = [f"≠ {app.cell(region)}" if region in app.outliers else app.cell(region) for region in regions]
+            wanted[app.app] = (tuple([app.app] + cells), ('drifted',) if app.drifted else ())
+
+        stale = [iid for iid in self._drift_shown if iid not in wanted]
+        if stale:
+            tree.delete(*stale)
+        for index, (iid, (values, tags)) in enumerate(wanted.items()):
+            old = self._drift_shown.get(iid)
+            if old is None:
+                tree.insert('', index, iid=iid, values=values, tags=tags)
+            elif old != (values, tags):
+                tree.item(iid, values=values, tags=tags)
+        if [iid for iid in self._drift_shown if iid in wanted] != [iid for iid in wanted if iid in self._drift_shown]:
+            for index, iid in enumerate(wanted):
+                tree.move(iid, '', index)
+        self._drift_shown = wanted
+
+    def _compared(self, row):
+        # Cells that differ from the row compared with read "then → now"
+        then = self._baseline.get((row[0], row[1])) if self._baseline else None
+        if then is None or row[5] == PENDING:
+            return tuple(row)
+        return tuple(row[:2]) + tuple(new if old == new else f"{old} → {new}" for old, new in zip(then[2:], row[2:]))
+
+    def _on_compare_changed(self, event=None):
+        choice = self.compare_with.get()
+        if choice in COMPARE_AGES:
+            future = self.history.rows_at(time.time() - COMPARE_AGES[choice])
+        elif choice == PREVIOUS_BUILD:
+            future = self.history.previous_builds()
+        else:
+            self._baseline = None
+            self.update_actuator_table(self.rows, highlight=False)
+            self.status_label.config(text="")
+            return
+        self.status_label.config(text="Reading history…")
+        future.add_done_callback(lambda f: self._post(self._on_baseline_loaded, choice, f))
+
+    def _on_baseline_loaded(self, choice, future):
+        if choice != self.compare_with.get():
+            return # Another choice was made meanwhile
+        try:
+            rows = future.result()
+        except Exception as e:
+            self.status_label.config(text=f"History not readable: {e}")
+            return
+        self._baseline = {(row[0], row[1]): row for row in rows}
+        self.update_actuator_table(self.rows, highlight=False)
+        if not rows:
+            self.status_label.config(text=f"Nothing recorded from {choice.lower()}")
+            return
+        differ = sum(1 for row in self.rows if self._compared(row) != tuple(row))
+        self.status_label.config(text=f"{differ} endpoints differ from {choice.lower()}")
+
+    def _on_app_selected(self, event):
+        selection = event.widget.selection()
+        if not selection:
+            return
+        app = selection[0].split('\t')[0] # Row table iids are "app\tregion", drift table iids the app
+        if app == self._builds_app:
+            return
+        self._builds_app = app
+        self.builds_label.config(text=f"Builds of {app}, newest first")
+        self.history.builds(app).add_done_callback(lambda f: self._post(self._on_builds_loaded, app, f))
+
+    def _on_builds_loaded(self, app, future):
+        if app != self._builds_app:
+            return
+        try:
+            builds = future.result()
+        except Exception as e:
+            self.builds_label.config(text=f"History not readable: {e}")
+            return
+        tree = self.builds_tree
+        tree.delete(*tree.get_children())
+        for seen_at, region, version, branch, commit_id in builds:
+            tree.insert('', 'end', values=(time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seen_at)),
+                                           region, version, branch, commit_id))
+
+    def _clear_highlights(self):
+        self._highlight_pending = False
+        now = time.monotonic()
+        for iid, until in list(self._highlights.items()):
+            if until <= now:
+                del self._highlights[iid]
+                self.actuator_tree.item(iid, values=self._shown[iid], tags=())
+        if self._highlights:
+            self._highlight_pending = True
+            self.after(int((min(self._highlights.values()) - now) * 1000) + 1, self._clear_highlights)
 
     def refresh_actuators(self):
-        # Mock data for now as requested
         # "Actuator tells me the git version / branch of the artifact and allows me to compare the same apps across regions."
-        mock_data = [
-            ('UserAuthService', 'us-east-1', '1.2.3-SNAPSHOT', 'main', 'a1b2c3d', 'UP'),
-            ('UserAuthService', 'eu-west-1', '1.2.3-SNAPSHOT', 'main', 'a1b2c3d', 'UP'),
-            ('PaymentGateway', 'us-east-1', '2.0.1', 'feature/new-pay', 'f4e5d6c', 'DOWN'),
-            ('InventoryService', 'us-east-1', '1.0.0', 'main', '9h8g7f6', 'UP'),
-            ('OrderService', 'us-west-2', '0.9.5', 'develop', '1a2b3c4', 'OUT_OF_SERVICE'),
-        ]
-        self.update_actuator_table(mock_data)
+        # Every endpoint is queried at once off the UI thread; rows fill in as they answer
+        endpoints = endpoints_from_settings(self.settings)
+        self._endpoints = endpoints
+        self.scheduler.set_endpoints(endpoints)
+        if not endpoints:
+            self.status_label.config(text="No actuator endpoints configured (actuator_endpoints in settings.json)")
+            self.update_actuator_table([])
+            return
+        if self.fetch_job:
+            self.fetch_job.cancel()
+
+        job = self.client.fetch_all(
+            endpoints,
+            lambda row: self.after(0, self._on_actuator_result, job, row),
+            on_done=lambda: self.after(0, self._on_refresh_done, job),
+            states=self.scheduler.states
+        )
+        self.fetch_job = job
+        self._flush_results()
+
+    def _on_actuator_result(self, job, row):
+        if job is not self.fetch_job:
+            return # A newer refresh replaced it
+        self._add_result(row)
+
+    def _add_result(self, row):
+        self._latest[(row[0], row[1])] = row
+        self._unrecorded.append(row)
+        if not self._flush_pending:
+            # Answers arriving together are shown in one table update
+            self._flush_pending = True
+            self.after(50, self._flush_results)
+
+    def _flush_results(self):
+        self._flush_pending = False
+        if self.history and self._unrecorded:
+            # Only rows that changed are written; unchanged answers cost a comparison
+            self.history.record(self._unrecorded).add_done_callback(self._report_history_error)
+            self._unrecorded = []
+        # Inventory order; endpoints that haven't answered yet are pending
+        self.update_actuator_table([self._latest.get((app, region)) or (app, region, '', '', '', PENDING)
+                                    for app, region, _ in self._endpoints])
+        job = self.fetch_job
+        if job is not None:
+            self.status_label.config(text=f"Refreshing… {job.completed}/{job.total}")
+
+    @staticmethod
+    def _report_history_error(future):
+        if future.exception():
+            print(f"Actuator history not saved: {future.exception()}")
+
+    def _on_refresh_done(self, job):
+        if job is not self.fetch_job:
+            return
+        self._flush_results()
+        self.fetch_job = None
+        down = sum(1 for row in self.rows if row[5] != 'UP')
+        drifted = sum(1 for app in drift_view(self.rows)[1] if app.drifted)
+        self.status_label.config(text=f"{job.total} endpoints in {job.duration:.1f}s, {down} not UP, {drifted} apps drifted")
 
 if __name__ == "__main__":
     import sys
@@ -1,27 +1,56 @@
 import tkinter as tk
 from tkinter import ttk
+from tkinter import font as tkfont
+import bisect
 import os
-import subprocess
-import threading
 import time
-import queue
 import re
+import sys
+import threading
+
+# Add src to path so we can import logic when run standalone
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic.history_search import HistorySearch
+from logic.log_index import LogIndex
+from logic.output_pump import OutputPump
+from logic.run_manager import Run, RunManager
+from logic.runner import ScriptRunner
+from logic.search import MAX_MATCHES, SearchJob, compile_query, find_matches
+
+# Largest piece of run output queued at once: reads grow to 256 KiB under a flood,
+# and the pump bounds each flush by size (OUTPUT_FLUSH_CHARS) to stay within its frame budget
+OUTPUT_CHUNK_CHARS = 16 * 1024
+OUTPUT_FLUSH_CHARS = 64 * 1024
 
 class ScriptsTab(ttk.Frame):
-    def __init__(self, parent, root):
+    def __init__(self, parent, root, region_provider=None):
         super().__init__(parent)
         self.root = root
+        self.region_provider = region_provider # Callable returning known regions (Actuators tab)
         
         self.root_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        self.scripts_dir = os.path.join(self.root_dir, 'scripts')
-        self.logs_dir = os.path.join(self.root_dir, 'logs')
-        self.scripts = {} # Map name -> full path
-        self.current_process = None
-        
-        if not os.path.exists(self.logs_dir):
-            os.makedirs(self.logs_dir)
-            
-        self.scan_scripts()
+        # Discovery, execution and logging live in the headless runner; this tab subscribes to it
+        self.runner = ScriptRunner(self.root_dir)
+        self.scripts_dir = self.runner.scripts_dir
+        self.logs_dir = self.runner.logs_dir
+        self.settings = self.runner.settings
+        self.classifier = self.runner.classifier
+        self.log_store = self.runner.log_store
+        self.run_manager = RunManager(self._start_run, self.settings['max_concurrent_runs'], on_change=self._update_run_controls)
+        self.run_views = {} # Notebook tab id -> Run
+        self.fanouts = {} # Notebook tab id -> (summary tree, [(run, target)])
+        self.history_log = None # PagedLog shown in the History preview
+        self.history_index = None # Its LogIndex (line tags), from the sidecar or built on demand
+        self._history_opening = None # Token of the log being opened on a worker; a newer selection replaces it
+        self.history_files = [] # Log file names, in History list order
+        self._history_line = -1 # Last line jumped to in the preview
+        self.history_script = None # Script whose logs the History list shows
+        self.search_all = None # Running HistorySearch
+        self.search_all_items = {} # Results tree iid -> (script, filename, line)
+        self.history_page_lines = 2000 # Lines loaded per page; at most 3 pages are kept in the widget
+        self._history_load_pending = False
+
         self._setup_ui()
 
     def _setup_ui(self):
@@ -37,11 +66,12 @@ class ScriptsTab(ttk.Frame):
         table_frame = ttk.Frame(top_frame)
         table_frame.pack(expand=True, fill='both')
         
-        columns = ('name', 'description')
-        self.script_tree = ttk.Treeview(table_frame, columns=columns, show='headings')
-        self.script_tree.heading('name', text='Script Name', anchor='w')
+        # Scripts are grouped under their folders; the tree column holds the name
+        columns = ('description',)
+        self.script_tree = ttk.Treeview(table_frame, columns=columns, show='tree headings')
+        self.script_tree.heading('#0', text='Script Name', anchor='w')
         self.script_tree.heading('description', text='Description', anchor='w')
-        self.script_tree.column('name', width=200, anchor='w')
+        self.script_tree.column('#0', width=200, anchor='w')
         self.script_tree.column('description', width=300, anchor='w')
         
         scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.script_tree.yview)
@@ -70,24 +100,32 @@ class ScriptsTab(ttk.Frame):
         self.run_button = ttk.Button(action_bar, text="❯ Run Selected Script", command=self._on_run_clicked, state='disabled')
         self.run_button.pack(side='left', padx=5)
 
+        self.stop_button = ttk.Button(action_bar, text="⏹ Stop", command=self._on_stop_clicked, state='disabled')
+        self.stop_button.pack(side='left', padx=5)
+
+        # Fan-out: one parallel run per flag value or region
+        self.fanout_button = ttk.Menubutton(action_bar, text="⇉ Fan-out", state='disabled')
+        fanout_menu = tk.Menu(self.fanout_button, tearoff=0)
+        fanout_menu.add_command(label="Per selected flag", command=self._on_fanout_flags)
+        fanout_menu.add_command(label="Per region (Actuators)", command=self._on_fanout_regions)
+        self.fanout_button.config(menu=fanout_menu)
+        self.fanout_button.pack(side='left', padx=5)
+
         # Flags Frame
         self.flags_frame = ttk.Frame(action_bar)
         self.flags_frame.pack(side='left', padx=10)
 
-        # Terminal Output (No Gutter)
-        terminal_frame = ttk.Frame(console_tab)
-        terminal_frame.pack(expand=True, fill='both', padx=5, pady=5)
-        
-        self.output_text = tk.Text(terminal_frame, state='normal', height=10, borderwidth=0)
-        output_scrollbar = ttk.Scrollbar(terminal_frame, orient=tk.VERTICAL, command=self.output_text.yview)
-        self.output_text.configure(yscrollcommand=output_scrollbar.set)
-        
-        self.output_text.pack(side='left', expand=True, fill='both')
-        output_scrollbar.pack(side='right', fill='y')
+        # Running / queued counter
+        self.runs_label = ttk.Label(action_bar, text="")
+        self.runs_label.pack(side='right', padx=5)
 
-        # Search Controls (Right aligned in action_bar)
-        search_frame, self.console_search_entry = self._create_search_bar(action_bar, self.output_text)
-        search_frame.pack(side='right')
+        # Output views: general messages plus one tab per run
+        self.run_notebook = ttk.Notebook(console_tab)
+        self.run_notebook.pack(expand=True, fill='both', padx=5, pady=5)
+        self.run_notebook.bind('<<NotebookTabChanged>>', lambda e: self._update_run_controls())
+
+        messages_view, self.output_text = self._create_console_view(self.run_notebook)
+        self.run_notebook.add(messages_view, text="Messages")
 
         # Input Field
         self.input_entry = tk.Entry(console_tab, font=("Consolas", 10), borderwidth=0)
@@ -101,20 +139,12 @@ class ScriptsTab(ttk.Frame):
         self.input_placeholder = "Input..."
         self.input_has_placeholder = True
         self.input_entry.insert(0, self.input_placeholder)
-        
-        # Configure tags - Order matters! First defined = Lowest priority
-        self.output_text.tag_config('normal', foreground='#ffffff') # Explicitly white for visibility
-        self.output_text.tag_config('error', foreground='#ff5555')
-        self.output_text.tag_config('info', foreground='#57c8ff')
-        self.output_text.tag_config('warning', foreground='#ffd700')
-        self.output_text.tag_config('highlight', background='yellow', foreground='black')
-        self.output_text.tag_config('current_match', background='orange', foreground='black')
 
         # --- History Tab ---
-        history_tab = ttk.Frame(self.bottom_notebook)
-        self.bottom_notebook.add(history_tab, text="History")
+        self.history_tab = ttk.Frame(self.bottom_notebook)
+        self.bottom_notebook.add(self.history_tab, text="History")
         
-        history_paned = ttk.PanedWindow(history_tab, orient=tk.HORIZONTAL)
+        history_paned = ttk.PanedWindow(self.history_tab, orient=tk.HORIZONTAL)
         history_paned.pack(expand=True, fill='both')
         
         # History List
@@ -136,9 +166,14 @@ class ScriptsTab(ttk.Frame):
         # History Search Bar
         history_search_frame = ttk.Frame(history_preview_frame)
         history_search_frame.pack(fill='x', pady=5)
+
+        # Jump between errors of the selected log
+        ttk.Button(history_search_frame, text="✖ Next error", command=lambda: self._jump_history_error(1)).pack(side='left', padx=(5, 1))
+        ttk.Button(history_search_frame, text="▲", width=3, command=lambda: self._jump_history_error(-1)).pack(side='left', padx=1)
         
         # History Text (with Gutter)
-        history_container, self.history_text, self.history_gutter = self._create_text_with_gutter(history_preview_frame)
+        history_container, self.history_text, self.history_gutter = self._create_text_with_gutter(
+            history_preview_frame, on_scroll=self._on_history_scroll)
         history_container.pack(side='left', expand=True, fill='both', padx=5, pady=5)
         
         # Create search bar
@@ -150,22 +185,154 @@ class ScriptsTab(ttk.Frame):
         self.history_text.tag_config('error', foreground='#ff5555')
         self.history_text.tag_config('info', foreground='#57c8ff')
         self.history_text.tag_config('warning', foreground='#ffd700')
-
-        # Initial Placeholder
-        self.clear_log() # Sets placeholder
-
-        # Initial Load
-        self._refresh_script_list()
+        self.history_text.tag_config('current_line', background='#404040')
+        self.history_text._line_offset = 0 # First log line loaded in the preview
+        self.history_text._window_end = 0
+
+        # --- Search All Tab ---
+        # Full-text search over the stored logs of every script
+        search_all_tab = ttk.Frame(self.bottom_notebook)
+        self.bottom_notebook.add(search_all_tab, text="Search All")
+
+        search_all_bar = ttk.Frame(search_all_tab)
+        search_all_bar.pack(fill='x', pady=5)
+        ttk.Label(search_all_bar, text="Search all history:").pack(side='left', padx=(5, 0))
+        self.search_all_entry = ttk.Entry(search_all_bar, width=40)
+        self.search_all_entry.pack(side='left', padx=5)
+        self.search_all_entry.bind('<Return>', lambda e: self._on_search_all())
+        self.search_all_case = tk.BooleanVar(value=False)
+        self.search_all_regex = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_all_bar, text="Aa", variable=self.search_all_case, style='Toggle.TCheckbutton').pack(side='left', padx=2)
+        ttk.Checkbutton(search_all_bar, text=".*", variable=self.search_all_regex, style='Toggle.TCheckbutton').pack(side='left', padx=2)
+        ttk.Button(search_all_bar, text="Search", command=self._on_search_all).pack(side='left', padx=5)
+        self.search_all_label = ttk.Label(search_all_bar, text="")
+        self.search_all_label.pack(side='left', padx=5)
+
+        results_frame = ttk.Frame(search_all_tab)
+        results_frame.pack(expand=True, fill='both', padx=5, pady=(0, 5))
+        self.search_all_tree = ttk.Treeview(results_frame, columns=('line', 'text'), show='tree headings')
+        self.search_all_tree.heading('#0', text='Script / Run', anchor='w')
+        self.search_all_tree.heading('line', text='Line', anchor='w')
+        self.search_all_tree.heading('text', text='Text', anchor='w')
+        self.search_all_tree.column('#0', width=260, anchor='w')
+        self.search_all_tree.column('line', width=70, anchor='w', stretch=False)
+        self.search_all_tree.column('text', width=500, anchor='w')
+        results_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.search_all_tree.yview)
+        self.search_all_tree.configure(yscrollcommand=results_scrollbar.set)
+        self.search_all_tree.pack(side='left', expand=True, fill='both')
+        results_scrollbar.pack(side='right', fill='y')
+        self.search_all_tree.bind('<Double-1>', self._on_search_all_open)
+
+        # Initial Load: rows appear as the scan finds them
+        self.runner.load_scripts(
+            lambda batch: self.root.after(0, self._add_scripts, batch),
+            on_done=lambda: self.root.after(0, self._on_scripts_loaded)
+        )
         
         # Set Sash Position (approx 25% of 800 height = 200)
         # Using self.root.after to ensure geometry is calculated
         self.root.after(100, lambda: paned_window.sashpos(0, 200))
 
-    def _on_script_selected(self, event):
+    def _create_console_view(self, parent, run=None):
+        frame = ttk.Frame(parent)
+
+        toolbar = ttk.Frame(frame)
+        toolbar.pack(fill='x', pady=(5, 0))
+
+        # Terminal Output (No Gutter)
+        terminal_frame = ttk.Frame(frame)
+        terminal_frame.pack(expand=True, fill='both', pady=5)
+        
+        text_widget = tk.Text(terminal_frame, state='normal', height=10, borderwidth=0)
+        output_scrollbar = ttk.Scrollbar(terminal_frame, orient=tk.VERTICAL, command=text_widget.yview)
+        def on_yscroll(*args):
+            output_scrollbar.set(*args)
+            self._schedule_highlight(text_widget) # Search matches are only tagged while visible
+        text_widget.configure(yscrollcommand=on_yscroll)
+        
+        text_widget.pack(side='left', expand=True, fill='both')
+        output_scrollbar.pack(side='right', fill='y')
+
+        if run is not None:
+            ttk.Button(toolbar, text="✕ Close", command=lambda: self._close_run_view(run)).pack(side='left')
+
+        # Search Controls (Right aligned)
+        search_frame, _ = self._create_search_bar(toolbar, text_widget)
+        search_frame.pack(side='right')
+
+        # Configure tags - Order matters! First defined = Lowest priority
+        text_widget.tag_config('normal', foreground='#ffffff') # Explicitly white for visibility
+        text_widget.tag_config('error', foreground='#ff5555')
+        text_widget.tag_config('info', foreground='#57c8ff')
+        text_widget.tag_config('warning', foreground='#ffd700')
+        text_widget.tag_config('highlight', background='yellow', foreground='black')
+        text_widget.tag_config('current_match', background='orange', foreground='black')
+
+        text_widget.view_frame = frame
+        self.clear_log(text_widget) # Sets placeholder
+        return frame, text_widget
+
+    def _selected_run(self):
+        try:
+            return self.run_views.get(self.run_notebook.select())
+        except tk.TclError:
+            return None
+
+    def _input_run(self):
+        # Input goes to the selected run, or the most recently started one
+        run = self._selected_run()
+        if run and run.status == 'running':
+            return run
+        running = self.run_manager.running()
+        return running[-1] if running else None
+
+    def _update_run_controls(self):
+        status_icons = {'queued': '⏳', 'running': '▶', 'finished': '✔', 'failed': '✖', 'aborted': '⏹', 'cancelled': '–'}
+        for tab_id, run in self.run_views.items():
+            self.run_notebook.tab(tab_id, text=f"{status_icons.get(run.status, '')} {run.label}")
+
+        for tree, targets in self.fanouts.values():
+            for run, target in targets:
+                duration = f"{run.duration:.1f}s" if run.duration is not None else ""
+                exit_code = run.returncode if run.returncode is not None else ""
+                tree.item(str(run.run_id), values=(target, run.status, exit_code, duration, run.error_count),
+                          tags=(run.status,))
+
+        run = self._selected_run()
+        fanout = self.fanouts.get(self.run_notebook.select())
+        if fanout:
+            active = any(run.is_active for run, _ in fanout[1])
+            self.stop_button.config(state='normal' if active else 'disabled')
+        else:
+            self.stop_button.config(state='normal' if run and run.is_active else 'disabled')
+
+        running = len(self.run_manager.active)
+        queued = len(self.run_manager.pending)
+        self.runs_label.config(text=f"{running} running, {queued} queued" if running or queued else "")
+
+    def _close_run_view(self, run):
+        if run.is_active:
+            return
+        frame = run.view.view_frame
+        self.run_notebook.forget(frame)
+        self.run_views.pop(str(frame), None)
+        frame.destroy()
+        self.run_manager.remove(run)
+
+    def _selected_script(self):
+        # Name of the selected script; None when nothing or a folder is selected
         selection = self.script_tree.selection()
-        if selection:
-            script_name = selection[0]
+        if selection and not selection[0].endswith('/'):
+            return selection[0]
+        return None
+
+    def _on_script_selected(self, event):
+        script_name = self._selected_script()
+        if script_name:
             self.run_button.config(state='normal')
+            self.fanout_button.config(state='normal')
+            if script_name == self.history_script:
+                return # Already shown (selected from code before the event arrived)
             
             # Update History Tab
             self._update_history_list(script_name)
@@ -174,96 +341,398 @@ class ScriptsTab(ttk.Frame):
             self._update_flags_ui(script_name)
         else:
             self.run_button.config(state='disabled')
+            self.fanout_button.config(state='disabled')
             self.history_listbox.delete(0, tk.END)
+            self.history_files = []
+            self.history_script = None
             self._clear_history_preview()
             self._clear_flags_ui()
 
     def _update_history_list(self, script_name):
         self.history_listbox.delete(0, tk.END)
-        history = self.get_script_history(script_name)
-        for item in history:
-            self.history_listbox.insert(tk.END, item)
+        self.history_script = script_name
+        self.history_files = self.get_script_history(script_name)
+        for filename in self.history_files:
+            # Counts come from the index footer; logs still being written have none yet
+            summary = self.log_store.read_summary(script_name, filename)
+            if summary:
+                _, errors, warnings = summary
+                self.history_listbox.insert(tk.END, f"{filename}   ✖ {errors}  ⚠ {warnings}")
+            else:
+                self.history_listbox.insert(tk.END, filename)
             
     def _clear_history_preview(self):
+        self._close_history_log()
         self.history_text.config(state='normal')
         self.history_text.delete(1.0, tk.END)
         self.history_text.config(state='disabled')
+        self.history_text._line_offset = 0
+        self.history_text._window_end = 0
         if hasattr(self, 'history_gutter'):
             self._update_line_numbers(self.history_text, self.history_gutter)
 
-    def _on_history_selected(self, event):
+    def _close_history_log(self):
+        self._history_opening = None
+        if self.history_log:
+            self.history_log.close()
+            self.history_log = None
+        self.history_index = None
+        self._history_line = -1
+
+    def _post(self, func, *args):
+        # Runs func(*args) on the Tk thread; called from worker threads
+        try:
+            self.root.after(0, func, *args)
+        except Exception:
+            pass # Root destroyed
+
+    def _on_history_selected(self, event, line=None):
+        # line: 0-based line of the log to show once it is open
         selection = self.history_listbox.curselection()
-        script_selection = self.script_tree.selection()
-        if selection and script_selection:
-            filename = self.history_listbox.get(selection[0])
-            script_name = script_selection[0]
-            content = self.get_log_content(script_name, filename)
-            
-            self.history_text.config(state='normal')
-            self.history_text.delete(1.0, tk.END)
-            
-            # Insert with tags
-            for line in content.splitlines(keepends=True):
-                tag = None
-                lower_text = line.lower()
-                if "error" in lower_text or "exception" in lower_text or "critical" in lower_text or "stderr" in lower_text or "failure" in lower_text:
-                    tag = 'error'
-                elif "warn" in lower_text:
-                    tag = 'warning'
-                elif "info" in lower_text:
-                    tag = 'info'
-                self.history_text.insert(tk.END, line, tag)
-            
-            self.history_text.config(state='disabled')
-            
-            # Force update line numbers
-            if hasattr(self, 'history_gutter'):
-                self._update_line_numbers(self.history_text, self.history_gutter)
-                
-            # Reset Search State
-            if hasattr(self.history_text, 'search_state'):
-                # Clear previous matches
-                self.history_text.tag_remove('highlight', '1.0', tk.END)
-                self.history_text.tag_remove('current_match', '1.0', tk.END)
-                
-                # Re-run search if there is a query
-                query = self.history_text.search_state['query']
-                if query:
-                    self._find_all(self.history_text, query)
-                else:
-                    # Just reset state
-                    self.history_text.search_state['matches'] = []
-                    self.history_text.search_state['current_index'] = -1
-                    self.history_text.search_state['label'].config(text="0/0")
+        script_name = self._selected_script()
+        if selection and script_name and selection[0] < len(self.history_files):
+            filename = self.history_files[selection[0]]
+            self._close_history_log()
+            path = self.log_store.resolve(script_name, filename)
+            if path is None:
+                self._on_history_opened(None, filename, None, None, None, line)
+                return
+
+            # Map the log, reusing the sidecar index for line offsets and tags when there is
+            # one. Decompressing and indexing a big log takes a while, so it happens on a
+            # worker while the preview says it's loading; only a window goes into the widget.
+            opening = self._history_opening = object()
+            text_widget = self.history_text
+            text_widget.config(state='normal')
+            text_widget.delete(1.0, tk.END)
+            text_widget.insert(tk.END, f"Loading {filename}…")
+            text_widget.config(state='disabled')
+            text_widget._line_offset = 0
+            text_widget._window_end = 0
+            self._update_line_numbers(text_widget, self.history_gutter)
+            self._find_all(text_widget, text_widget.search_state['query']) # Stop searching the previous log
+
+            def open_log():
+                log = index = error = None
+                try:
+                    index = self.log_store.load_index(path)
+                    log = self.log_store.open_paged(path, offsets=index.offsets() if index else None)
+                    log.line_count # Builds the line offsets if the index had none
+                except Exception as e:
+                    if log:
+                        log.close()
+                    log, error = None, e
+                self._post(self._on_history_opened, opening, filename, log, index, error, line)
+            threading.Thread(target=open_log, name='history-open', daemon=True).start()
+
+    def _on_history_opened(self, opening, filename, log, index, error, line):
+        if opening is not self._history_opening:
+            if log:
+                log.close() # Another log was selected meanwhile
+            return
+        self._history_opening = None
+        if error:
+            self.append_log(f"Error opening log {filename}: {error}\n", 'error')
+        self.history_log = log
+        if log and index and index.line_count == log.line_count:
+            self.history_index = index
+        self._load_history_window(0)
+
+        # Search the new log for the current query (or just reset the search)
+        self._find_all(self.history_text, self.history_text.search_state['query'])
+        if line is not None:
+            self.history_text.search_state['anchor'] = line
+            self._show_history_line(line)
+
+    def _on_search_all(self):
+        query = self.search_all_entry.get()
+        if self.search_all:
+            self.search_all.cancel()
+            self.search_all = None
+        self.search_all_tree.delete(*self.search_all_tree.get_children())
+        self.search_all_items = {}
+        self.search_all_label.config(text="")
+        if not query:
+            return
+        try:
+            pattern = compile_query(query, self.search_all_case.get(), self.search_all_regex.get(), binary=True)
+        except re.error as e:
+            self.search_all_label.config(text=f"Invalid regex: {e}")
+            return
 
-    def _on_run_clicked(self):
-        selection = self.script_tree.selection()
-        if not selection:
+        def on_results(script, filename, hits, truncated):
+            try:
+                self.root.after(0, self._on_search_all_results, search, script, filename, hits, truncated)
+            except Exception:
+                pass # Root destroyed
+        search = HistorySearch(self.log_store, pattern, on_results)
+        search.query = (query, self.search_all_case.get(), self.search_all_regex.get())
+        search.searched = 0
+        search.hits = 0
+        self.search_all = search
+        search.start()
+        self._update_search_all_label(search)
+
+    def _on_search_all_results(self, search, script, filename, hits, truncated):
+        if search is not self.search_all:
+            return # Superseded
+        search.searched += 1
+        if hits:
+            search.hits += len(hits)
+            tree = self.search_all_tree
+            if not tree.exists(script):
+                # Scripts in name order
+                scripts = tree.get_children('')
+                tree.insert('', bisect.bisect(scripts, script), iid=script, text=script, open=True)
+            # Runs newest first, like the History list
+            runs = [self.search_all_items[iid][1] for iid in tree.get_children(script)]
+            position = sum(1 for name in runs if name > filename)
+            count = f"{len(hits)}+" if truncated else str(len(hits))
+            run_iid = tree.insert(script, position, text=f"{filename} ({count})")
+            self.search_all_items[run_iid] = (script, filename, hits[0][0])
+            for line, text in hits:
+                iid = tree.insert(run_iid, tk.END, values=(line + 1, text))
+                self.search_all_items[iid] = (script, filename, line)
+        self._update_search_all_label(search)
+
+    def _update_search_all_label(self, search):
+        progress = "" if search.searched >= search.total else f" - searching {search.searched}/{search.total} logs…"
+        self.search_all_label.config(text=f"{search.hits} hits in {search.total} logs{progress}")
+
+    def _on_search_all_open(self, event):
+        # Open the run in the History tab at the hit (a run row opens at its first hit)
+        item = self.search_all_items.get(self.search_all_tree.focus())
+        if not item or self.search_all is None:
+            return
+        script_name, filename, line = item
+        if not self.script_tree.exists(script_name):
+            self.root.bell() # Logs of a script that no longer exists
+            return
+        self.script_tree.selection_set(script_name)
+        self.script_tree.see(script_name)
+        self._on_script_selected(None)
+
+        # The log may have been compressed since the search
+        names = (filename, filename + '.gz', filename[:-3] if filename.endswith('.gz') else filename)
+        index = next((i for i, name in enumerate(self.history_files) if name in names), None)
+        if index is None:
+            self.root.bell()
             return
 
-        current_text = self.run_button.cget('text')
+        # Find the same text in the preview, starting at the hit's line
+        query, case_sensitive, use_regex = self.search_all.query
+        state = self.history_text.search_state
+        state['case_var'].set(case_sensitive)
+        state['regex_var'].set(use_regex)
+        state['query'] = query
+        self.history_search_entry.delete(0, tk.END)
+        self.history_search_entry.insert(0, query)
+
+        self.history_listbox.selection_clear(0, tk.END)
+        self.history_listbox.selection_set(index)
+        self.history_listbox.see(index)
+        self.bottom_notebook.select(self.history_tab)
+        self._on_history_selected(None, line=line)
+
+    def _insert_history_lines(self, start, end, index=tk.END):
+        # Insert lines [start, end) of the history log, tagged like the live console
+        lines = self.history_log.lines(start, end)
+        if self.history_index:
+            line_tags = self.history_index.line_tags(start, end)
+        else:
+            line_tags = self.classifier.classify_batch(lines)
+        self._insert_tagged(self.history_text, lines, line_tags, index=index)
+
+    def _load_history_window(self, start):
+        # Replace the preview with the window starting at line `start` (0-based)
+        text_widget = self.history_text
+        log = self.history_log
+        text_widget.config(state='normal')
+        text_widget.delete(1.0, tk.END)
+        end = start = 0 if log is None else max(0, min(start, log.line_count - self.history_page_lines))
+        if log:
+            end = min(log.line_count, start + 2 * self.history_page_lines)
+            self._insert_history_lines(start, end)
+        text_widget.config(state='disabled')
+
+        # Gutter shows true line numbers
+        text_widget._line_offset = start
+        text_widget._window_end = end
+        self._update_line_numbers(text_widget, self.history_gutter)
+        self._schedule_highlight(text_widget)
+
+    def _show_history_line(self, line):
+        # Scroll the preview to a 0-based line of the log, loading its page if needed
+        text_widget = self.history_text
+        if not text_widget._line_offset <= line < text_widget._window_end:
+            self._load_history_window(line - self.history_page_lines // 2)
+        row = line - text_widget._line_offset + 1
+        text_widget.tag_remove('current_line', '1.0', tk.END)
+        text_widget.tag_add('current_line', f"{row}.0", f"{row}.0 lineend")
+        text_widget.see(f"{row}.0")
+        self._history_line = line
+        self._update_line_numbers(text_widget, self.history_gutter)
+
+    def _jump_history_error(self, direction):
+        if self.history_log is None:
+            return
+        if self.history_index is None:
+            # Older logs have no sidecar: classify once, then jumps are lookups
+            self.history_index = LogIndex.build(self.history_log, self.classifier)
+        if direction > 0:
+            line = self.history_index.next_line('error', self._history_line)
+        else:
+            before = self._history_line if self._history_line >= 0 else self.history_index.line_count
+            line = self.history_index.prev_line('error', before)
+        if line is None:
+            self.root.bell()
+            return
+        self._show_history_line(line)
+
+    def _on_history_scroll(self, first, last):
+        # Load the next page once the view gets close to either end of the window
+        log = self.history_log
+        if log is None or self._history_load_pending:
+            return
+        text_widget = self.history_text
+        if float(last) > 0.9 and text_widget._window_end < log.line_count:
+            direction = 1
+        elif float(first) < 0.1 and text_widget._line_offset > 0:
+            direction = -1
+        else:
+            return
+        # Not from inside the scroll callback: inserting triggers another one
+        self._history_load_pending = True
+        self.root.after_idle(lambda: self._extend_history_window(direction))
+
+    def _extend_history_window(self, direction):
+        self._history_load_pending = False
+        log = self.history_log
+        if log is None:
+            return
+        text_widget = self.history_text
+        page = self.history_page_lines
+        start = text_widget._line_offset
+        end = text_widget._window_end
+        # Remember which file line is at the top so the view doesn't jump
+        top = start + int(text_widget.index('@0,0').split('.')[0]) - 1
+
+        text_widget.config(state='normal')
+        if direction > 0:
+            new_end = min(log.line_count, end + page)
+            self._insert_history_lines(end, new_end)
+            end = new_end
+            if end - start > 3 * page:
+                drop = end - start - 3 * page
+                text_widget.delete('1.0', f"{drop + 1}.0")
+                start += drop
+        else:
+            new_start = max(0, start - page)
+            self._insert_history_lines(new_start, start, index='1.0')
+            start = new_start
+            if end - start > 3 * page:
+                end = start + 3 * page
+                text_widget.delete(f"{end - start + 1}.0", tk.END)
+        text_widget.config(state='disabled')
+
+        text_widget._line_offset = start
+        text_widget._window_end = end
+        text_widget.yview(f"{top - start + 1}.0")
+        self._update_line_numbers(text_widget, self.history_gutter)
+        self._highlight_visible(text_widget)
+
+    def _on_run_clicked(self):
+        script_name = self._selected_script()
+        if not script_name:
+            return
         
-        if "Stop" in current_text:
-            # Stop Action
-            self.abort_script()
-            self.run_button.config(state='disabled') # Disable until stopped
+        # Collect flags
+        selected_flags = []
+        if hasattr(self, 'flag_vars'):
+            for flag, var in self.flag_vars.items():
+                if var.get():
+                    selected_flags.append(flag)
+
+        self.run_script(script_name, flags=selected_flags)
+
+    def _on_stop_clicked(self):
+        # On a fan-out summary, stop every run of the group
+        fanout = self.fanouts.get(self.run_notebook.select())
+        if fanout:
+            for run, _ in fanout[1]:
+                if run.is_active:
+                    self.abort_script(run)
         else:
-            # Run Action
-            self.clear_log()
-            script_name = selection[0]
-            
-            # Update UI state
-            self.run_button.config(text="⏹ Stop Script")
-            self.script_tree.config(selectmode='none')
-            
-            # Collect flags
-            selected_flags = []
-            if hasattr(self, 'flag_vars'):
-                for flag, var in self.flag_vars.items():
-                    if var.get():
-                        selected_flags.append(flag)
+            self.abort_script()
 
-            self.run_script(script_name, flags=selected_flags)
+    def _on_fanout_flags(self):
+        script_name = self._selected_script()
+        if not script_name:
+            return
+        flags = [flag for flag, var in getattr(self, 'flag_vars', {}).items() if var.get()]
+        if not flags:
+            self.append_log("Fan-out: select the flags to run against first.\n", 'warning')
+            return
+        self.fan_out(script_name, [(flag, [flag]) for flag in flags])
+
+    def _on_fanout_regions(self):
+        script_name = self._selected_script()
+        if not script_name:
+            return
+        regions = self.region_provider() if self.region_provider else []
+        if not regions:
+            self.append_log("Fan-out: no regions known yet, refresh the Actuators tab first.\n", 'warning')
+            return
+        # Checked flags are passed to every run, followed by the region
+        flags = [flag for flag, var in getattr(self, 'flag_vars', {}).items() if var.get()]
+        self.fan_out(script_name, [(region, flags + [region]) for region in regions])
+
+    def fan_out(self, script_name, targets):
+        # targets: [(label, flags)] - one run each, executed in parallel by the run manager
+        runs = []
+        for target, flags in targets:
+            run = self.run_script(script_name, flags=flags, label=f"{script_name} [{target}]")
+            if run:
+                runs.append((run, target))
+        if not runs:
+            return
+
+        frame = ttk.Frame(self.run_notebook)
+        toolbar = ttk.Frame(frame)
+        toolbar.pack(fill='x', pady=(5, 0))
+        ttk.Button(toolbar, text="✕ Close", command=lambda: self._close_fanout(frame)).pack(side='left')
+
+        columns = ('target', 'status', 'exit_code', 'duration', 'errors')
+        tree = ttk.Treeview(frame, columns=columns, show='headings')
+        tree.heading('target', text='Target', anchor='w')
+        tree.heading('status', text='Status', anchor='w')
+        tree.heading('exit_code', text='Exit Code', anchor='w')
+        tree.heading('duration', text='Duration', anchor='w')
+        tree.heading('errors', text='Errors', anchor='w')
+        tree.tag_configure('failed', foreground='#ff5555')
+        tree.tag_configure('aborted', foreground='#ffd700')
+        tree.pack(expand=True, fill='both', pady=5)
+        for run, target in runs:
+            tree.insert('', tk.END, iid=str(run.run_id), values=(target, run.status, '', '', 0))
+
+        # Double-click jumps to the run's output
+        run_by_iid = {str(run.run_id): run for run, _ in runs}
+        def on_open(event):
+            selection = tree.selection()
+            run = run_by_iid.get(selection[0]) if selection else None
+            if run and str(run.view.view_frame) in self.run_views:
+                self.run_notebook.select(run.view.view_frame)
+        tree.bind('<Double-1>', on_open)
+
+        self.fanouts[str(frame)] = (tree, runs)
+        self.run_notebook.add(frame, text=f"Σ {script_name}")
+        self.run_notebook.select(frame)
+        self._update_run_controls()
+
+    def _close_fanout(self, frame):
+        self.run_notebook.forget(frame)
+        self.fanouts.pop(str(frame), None)
+        frame.destroy()
 
     def _on_input_return(self, event):
         # Don't send if placeholder is active
@@ -272,73 +741,127 @@ class ScriptsTab(ttk.Frame):
             
         text = self.input_entry.get()
         if text:
-            self.append_log(f"{text}\n", 'info') # Echo input to log
-            self.send_input(text)
+            run = self._input_run()
+            self.append_log(f"{text}\n", 'info', run.view if run else None) # Echo input to log
+            self.send_input(text, run)
             self.input_entry.delete(0, tk.END)
             self._reset_input_style()
 
     def _reset_input_style(self):
         self.input_entry.config(highlightthickness=0)
 
-    def on_script_finished(self):
+    def on_script_finished(self, run):
         self._reset_input_style()
-        self.run_button.config(state='normal', text="❯ Run Selected Script")
-        self.script_tree.config(selectmode='browse')
+        self.run_manager.finished(run, run.process.returncode if run.process else None)
         
         # Refresh history if the finished script is selected
-        selection = self.script_tree.selection()
-        if selection:
-            self._update_history_list(selection[0])
+        if self._selected_script() == run.script_name:
+            self._update_history_list(run.script_name)
 
     def _refresh_script_list(self):
-        # Clear
-        for item in self.script_tree.get_children():
-            self.script_tree.delete(item)
-        
-        # Get data
-        scripts_metadata = self.get_scripts_metadata()
-        for filename, display_name, description, flags in scripts_metadata:
+        # Rows are updated in place so the selection survives a rescan
+        names = set()
+        positions = {} # Folder node -> index of its next script
+        for filename, display_name, description, flags in self.get_scripts_metadata():
+            names.add(filename)
+            parent = self._ensure_category(filename)
+            index = positions.get(parent, 0)
+            positions[parent] = index + 1
+            self._put_script_row(filename, display_name, description, parent, index)
+        self._prune_script_tree('', names)
+
+    def _add_scripts(self, batch):
+        # Rows arrive in scan order; descriptions of scripts still being parsed follow later
+        for filename, display_name, description, flags in batch:
+            self._put_script_row(filename, display_name, description, self._ensure_category(filename))
+
+    def _on_scripts_loaded(self):
+        # Edits to the scripts folders show up without a restart
+        self.runner.watch_scripts(lambda: self.root.after(0, self._on_scripts_changed), self.settings['script_poll_interval'])
+
+    def _put_script_row(self, filename, display_name, description, parent, index=tk.END):
+        values = (description if description is not None else "…",)
+        if self.script_tree.exists(filename):
+            self.script_tree.item(filename, text=display_name, values=values)
+            if index != tk.END:
+                self.script_tree.move(filename, parent, index)
+        else:
             # Use filename as the item ID so we can retrieve it easily
-            self.script_tree.insert('', tk.END, iid=filename, values=(display_name, description))
-
-    def append_log(self, message, tag=None):
-        self.append_log_batch([message], tag)
-
-    def append_log_batch(self, messages, tag=None, skip_search_update=False, skip_ui_updates=False):
-        self.output_text.config(state='normal')
+            self.script_tree.insert(parent, index, iid=filename, text=display_name, values=values)
+
+    def _ensure_category(self, script_name):
+        # Folder node of a script, created on demand; '' for scripts at the top of a root
+        folder = script_name.rpartition('/')[0]
+        if not folder:
+            return ''
+        iid = folder + '/' # Can't clash with a script name
+        if not self.script_tree.exists(iid):
+            parent = self._ensure_category(folder)
+            self.script_tree.insert(parent, tk.END, iid=iid, text=folder.rpartition('/')[2], values=('',), open=True)
+        return iid
+
+    def _prune_script_tree(self, parent, names):
+        # Remove scripts that are gone, then folders left empty
+        for item in self.script_tree.get_children(parent):
+            if item.endswith('/'):
+                self._prune_script_tree(item, names)
+                if not self.script_tree.get_children(item):
+                    self.script_tree.delete(item)
+            elif item not in names:
+                self.script_tree.delete(item)
+
+    def _on_scripts_changed(self):
+        self._refresh_script_list()
+        script_name = self._selected_script()
+        if script_name:
+            # Rebuild the flag toggles only if the selected script's flags were edited
+            _, flags = self.get_script_details(script_name)
+            if flags != list(self.flag_vars):
+                self._update_flags_ui(script_name)
+
+    def append_log(self, message, tag=None, text_widget=None):
+        self.append_log_batch([message], tag, text_widget=text_widget)
+
+    def append_log_batch(self, messages, tag=None, skip_search_update=False, skip_ui_updates=False, text_widget=None):
+        # Defaults to the general messages view; runs pass their own view
+        text_widget = text_widget or self.output_text
+        text_widget.config(state='normal')
         
         # Check if placeholder is present (only on first batch)
-        if not skip_ui_updates and self.output_text.get("1.0", "end-1c") == "Terminal Output...":
-            self.output_text.delete("1.0", tk.END)
-            
+        # (tracked with a flag - reading the whole buffer back gets slow on big outputs)
+        if not skip_ui_updates and getattr(text_widget, '_has_placeholder', False):
+            text_widget.delete("1.0", tk.END)
+            text_widget._has_placeholder = False
+
+        # Split multi-line messages into individual lines for proper tag detection
+        lines = []
+        line_tags = []
         for item in messages:
             if isinstance(item, tuple):
                 message, current_tag = item
             else:
                 message = item
                 current_tag = tag
-
-            # Split multi-line messages into individual lines for proper tag detection
-            lines = message.splitlines(keepends=True)
-            for line in lines:
-                line_tag = current_tag
-                
-                if not line_tag:
-                    lower_text = line.lower().strip()
-                    # Stricter tagging heuristics
-                    if re.search(r'(^|\[)error($|\]|:)', lower_text) or "exception:" in lower_text or "critical" in lower_text:
-                        line_tag = 'error'
-                    elif re.search(r'(^|\[)warn(ing)?($|\]|:)', lower_text):
-                        line_tag = 'warning'
-                    elif re.search(r'(^|\[)info($|\]|:)', lower_text):
-                        line_tag = 'info'
-                
-                # Use 'normal' tag to prevent inheritance
-                tags = ['normal']
-                if line_tag:
-                    tags.append(line_tag)
-                
-                self.output_text.insert(tk.END, line, tuple(tags))
+            for line in message.splitlines(keepends=True):
+                lines.append(line)
+                line_tags.append(current_tag)
+
+        # Classify all untagged lines of the batch in one pass
+        untagged = [i for i, line_tag in enumerate(line_tags) if not line_tag]
+        if untagged:
+            detected = self.classifier.classify_batch([lines[i] for i in untagged])
+            for i, line_tag in zip(untagged, detected):
+                line_tags[i] = line_tag
+
+        # Use 'normal' tag to prevent inheritance
+        self._insert_tagged(text_widget, lines, line_tags, base_tags=('normal',))
+        text = ''.join(lines)
+        self._mirror_append(text_widget, text)
+
+        # Keep memory flat on long runs by evicting the oldest lines in bulk.
+        # scrollback_bytes is a limit in UTF-8 bytes, not characters
+        text_widget._scrollback_bytes = getattr(text_widget, '_scrollback_bytes', 0) + len(text.encode('utf-8', errors='replace'))
+        self._enforce_scrollback(text_widget, self.settings['scrollback_lines'], self.settings['scrollback_bytes'])
 
         # Heuristic for input prompt (check last message)
         # Check ALWAYS, even if skipping UI updates, to ensure we catch the prompt
@@ -356,16 +879,38 @@ class ScriptsTab(ttk.Frame):
 
         # Only do expensive UI updates if not skipped
         if not skip_ui_updates:
-            self.output_text.see(tk.END)
+            text_widget.see(tk.END)
             
-            # Update search only if requested (skip during high-volume batching)
+            # Update search only if requested: scans just the text added since the last search
             if not skip_search_update:
-                if hasattr(self.output_text, 'search_state'):
-                    query = self.output_text.search_state.get('query')
-                    if query:
-                        self._find_all(self.output_text, query)
-
-        self.output_text.config(state='disabled')
+                self._search_appended(text_widget)
+
+        text_widget.config(state='disabled')
+        return line_tags
+
+    def _flush_run_output(self, run, items, final):
+        line_tags = self.append_log_batch(items, text_widget=run.view)
+        run.error_count += line_tags.count('error')
+
+    def _insert_tagged(self, text_widget, lines, line_tags, base_tags=(), index=tk.END):
+        # Coalesce runs of same-tag lines, then insert everything with one
+        # multi-chunk call: insert(index, text1, tags1, text2, tags2, ...)
+        chunks = []
+        run = []
+        run_tag = None
+        for line, line_tag in zip(lines, line_tags):
+            if run and line_tag != run_tag:
+                chunks.append(''.join(run))
+                chunks.append(base_tags + (run_tag,) if run_tag else base_tags)
+                run = []
+            run.append(line)
+            run_tag = line_tag
+        if run:
+            chunks.append(''.join(run))
+            chunks.append(base_tags + (run_tag,) if run_tag else base_tags)
+
+        if chunks:
+            text_widget.insert(index, *chunks)
 
     def notify_input_requested(self):
         # Visual notification (Orange border)
@@ -387,11 +932,88 @@ class ScriptsTab(ttk.Frame):
             # self.input_entry.config(foreground='gray')
             self.input_has_placeholder = True
 
-    def clear_log(self):
-        self.output_text.config(state='normal')
-        self.output_text.delete(1.0, tk.END)
-        self.output_text.insert(tk.END, "Terminal Output...", 'placeholder')
-        self.output_text.config(state='disabled')
+    def clear_log(self, text_widget=None):
+        text_widget = text_widget or self.output_text
+        text_widget.config(state='normal')
+        text_widget.delete(1.0, tk.END)
+        text_widget.insert(tk.END, "Terminal Output...", 'placeholder')
+        text_widget.config(state='disabled')
+        text_widget._scrollback_bytes = 0
+        text_widget._line_offset = 0
+        text_widget._has_placeholder = True
+        # Python-side copy of the text for searching: (line, col, text) chunks as appended
+        text_widget._mirror = []
+        text_widget._mirror_end = (0, 0)
+        text_widget._mirror_dropped = 0 # Chunks evicted from the front so far
+        state = getattr(text_widget, 'search_state', None)
+        if state and state['query']:
+            self._find_all(text_widget, state['query']) # Old matches are gone with the text
+
+    def _mirror_append(self, text_widget, text):
+        if not text or not hasattr(text_widget, '_mirror'):
+            return
+        line, col = text_widget._mirror_end
+        text_widget._mirror.append((line, col, text))
+        newlines = text.count('\n')
+        if newlines:
+            line += newlines
+            col = len(text) - text.rfind('\n') - 1
+        else:
+            col += len(text)
+        text_widget._mirror_end = (line, col)
+
+    def _enforce_scrollback(self, text_widget, max_lines, max_bytes):
+        # Bulk-evict the oldest lines once a limit is exceeded. We trim down to 90%
+        # of the limit so eviction happens once per ~10% of output, not every flush.
+        try:
+            lines = int(text_widget.index('end-1c').split('.')[0])
+        except ValueError:
+            return
+        size = getattr(text_widget, '_scrollback_bytes', 0)
+
+        evict = 0
+        if max_lines and lines > max_lines:
+            evict = lines - int(max_lines * 0.9)
+        if max_bytes and size > max_bytes:
+            # Estimate how many lines cover the excess from the average line length
+            excess = size - int(max_bytes * 0.9)
+            avg_line = max(1, size // max(1, lines))
+            evict = max(evict, -(-excess // avg_line))
+
+        # Always keep the last (possibly partial) line
+        evict = min(evict, lines - 1)
+        if evict <= 0:
+            return
+
+        cut = f"{evict + 1}.0"
+        removed = len(text_widget.get('1.0', cut).encode('utf-8', errors='replace'))
+        text_widget.delete('1.0', cut) # Tags on the removed range go with it
+        text_widget._scrollback_bytes = max(0, size - removed)
+        # Gutter keeps showing true line numbers
+        text_widget._line_offset = getattr(text_widget, '_line_offset', 0) + evict
+
+        # Drop mirror chunks that now lie entirely above the first line
+        mirror = getattr(text_widget, '_mirror', None)
+        if mirror:
+            offset = text_widget._line_offset
+            drop = 0
+            while drop + 1 < len(mirror) and (mirror[drop + 1][0] < offset or mirror[drop + 1][:2] == (offset, 0)):
+                drop += 1
+            del mirror[:drop]
+            text_widget._mirror_dropped += drop
+
+        # Matches use true line numbers, so only the evicted ones go
+        state = getattr(text_widget, 'search_state', None)
+        if state and state['matches']:
+            dropped = bisect.bisect_left(state['matches'], (text_widget._line_offset,))
+            if dropped:
+                del state['matches'][:dropped]
+                state['current_index'] = max(0, state['current_index'] - dropped) if state['matches'] else -1
+                self._update_search_label(text_widget)
+
+        gutter = getattr(text_widget, 'gutter', None)
+        if gutter is not None:
+            self._update_line_numbers(text_widget, gutter)
 
     def _find_text(self, text_widget, query):
         text_widget.tag_remove('highlight', '1.0', tk.END)
@@ -468,74 +1090,190 @@ class ScriptsTab(ttk.Frame):
             'query': '',
             'label': count_label,
             'case_var': case_var,
-            'regex_var': regex_var
+            'regex_var': regex_var,
+            'job': None, # SearchJob still running
+            'pattern': None,
+            'scanned_chunks': 0, # Mirror chunks covered by the matches (counting evicted ones)
+            'truncated': False,
+            'anchor': None, # Line the first match shown should be on or after
+            'highlight_pending': False
         }
         
         return frame, entry
 
     def _find_all(self, text_widget, query):
+        state = text_widget.search_state
+        # A new query (or new content) supersedes a search that is still running
+        if state['job']:
+            state['job'].cancel()
+            state['job'] = None
         text_widget.tag_remove('highlight', '1.0', tk.END)
         text_widget.tag_remove('current_match', '1.0', tk.END)
         
-        state = text_widget.search_state
-        state['matches'] = []
+        state['matches'] = [] # (line, col, length), lines counted like the gutter (0-based)
         state['current_index'] = -1
         state['query'] = query
+        state['pattern'] = None
+        state['truncated'] = False
+        state['anchor'] = None
         
         if not query:
             state['label'].config(text="0/0")
             return
-            
-        # Get toggle states
-        case_sensitive = state['case_var'].get()
-        use_regex = state['regex_var'].get()
-        
-        start_pos = '1.0'
-        while True:
-            # Prepare search arguments
-            kwargs = {'stopindex': tk.END}
-            if not case_sensitive:
-                kwargs['nocase'] = True
-            if use_regex:
-                kwargs['regexp'] = True
-                
+
+        try:
+            pattern = compile_query(query, state['case_var'].get(), state['regex_var'].get())
+        except re.error:
+            # Invalid regex
+            state['label'].config(text="0/0")
+            return
+
+        # Scan on a worker thread; results arrive in chunks on the UI thread
+        def on_results(matches, done):
             try:
-                start_pos = text_widget.search(query, start_pos, **kwargs)
-            except tk.TclError:
-                # Invalid regex
-                break
-                
-            if not start_pos:
-                break
-                
-            # Calculate end position
-            if use_regex:
-                # For regex, we need the match length. 
-                # Tkinter search returns match length in 'count' variable if requested.
-                # But search() wrapper in Python simplifies this.
-                # Actually, text.search(..., count=var) is the way.
-                # Let's re-implement with count for regex support.
-                count_var = tk.IntVar()
-                kwargs['count'] = count_var
-                start_pos = text_widget.search(query, start_pos, **kwargs)
-                if not start_pos: 
-                    break
-                match_len = count_var.get()
-                if match_len == 0: match_len = 1 # Avoid infinite loop on empty match
+                self.root.after(0, self._on_search_results, text_widget, job, matches, done)
+            except Exception:
+                pass # Root destroyed
+        job = SearchJob(pattern, self._search_blocks(text_widget), on_results)
+        state['job'] = job
+        state['pattern'] = pattern
+        if hasattr(text_widget, '_mirror'):
+            # Everything up to here is in the job's snapshot; later output is scanned incrementally
+            state['scanned_chunks'] = text_widget._mirror_dropped + len(text_widget._mirror)
+        self._update_search_label(text_widget)
+        job.start()
+
+    def _search_blocks(self, text_widget):
+        # What a search scans: the whole history log, or the view's Python-side copy
+        if text_widget is self.history_text:
+            return self.history_log.blocks() if self.history_log else []
+        mirror = getattr(text_widget, '_mirror', None)
+        if mirror is None:
+            return [(getattr(text_widget, '_line_offset', 0), 0, text_widget.get('1.0', 'end-1c'))]
+        snapshot = list(mirror)
+        def blocks():
+            # Joined on the worker thread
+            if snapshot:
+                yield snapshot[0][0], snapshot[0][1], ''.join(chunk for _, _, chunk in snapshot)
+        return blocks()
+
+    def _on_search_results(self, text_widget, job, matches, done):
+        state = text_widget.search_state
+        if state['job'] is not job:
+            return # Superseded
+        if matches and text_widget is not self.history_text:
+            # Lines evicted from the view while the search ran
+            first = text_widget._line_offset
+            if matches[0][0] < first:
+                matches = [m for m in matches if m[0] >= first]
+        state['matches'].extend(matches)
+        if done:
+            state['job'] = None
+            state['truncated'] = job.truncated
+            self._search_appended(text_widget) # Catch up with output added meanwhile
+
+        if state['current_index'] < 0 and state['matches']:
+            # Start at the first match, or the first one from the anchor line on
+            index = 0
+            if state['anchor'] is not None:
+                index = bisect.bisect_left(state['matches'], (state['anchor'],))
+                if index == len(state['matches']):
+                    index = None if state['job'] else 0 # Not found yet
+            if index is not None:
+                state['anchor'] = None
+                state['current_index'] = index
+                self._highlight_current(text_widget)
             else:
-                match_len = len(query)
-                
-            end_pos = f"{start_pos}+{match_len}c"
-            text_widget.tag_add('highlight', start_pos, end_pos)
-            state['matches'].append(start_pos)
-            start_pos = end_pos
-            
-        count = len(state['matches'])
-        if count > 0:
-            state['current_index'] = 0
-            self._highlight_current(text_widget)
+                self._update_search_label(text_widget)
         else:
-            state['label'].config(text="0/0")
+            self._update_search_label(text_widget)
+            if matches:
+                self._highlight_visible(text_widget)
+
+    def _search_appended(self, text_widget):
+        # Incremental search of live output: scan only the mirror chunks added since the
+        # last scan and append their matches, so the cost follows new output, not total output
+        state = getattr(text_widget, 'search_state', None)
+        mirror = getattr(text_widget, '_mirror', None)
+        if not state or state['pattern'] is None or mirror is None or state['job'] or state['truncated']:
+            return # No query, or a full search is still running and will catch up when done
+        first = max(0, state['scanned_chunks'] - text_widget._mirror_dropped)
+        if first >= len(mirror):
+            return
+        line, col, _ = mirror[first]
+        text = ''.join(chunk for _, _, chunk in mirror[first:])
+
+        matches = state['matches']
+        if col:
+            # The previous scan ended mid-line: rescan that line so matches across
+            # the boundary are found, replacing its old matches
+            prefix = []
+            need = col
+            for _, _, chunk in reversed(mirror[:first]):
+                prefix.append(chunk[-need:])
+                need -= len(prefix[-1])
+                if not need:
+                    break
+            prefix = ''.join(reversed(prefix))
+            text = prefix + text
+            col -= len(prefix)
+            while matches and matches[-1][0] >= line:
+                matches.pop()
+
+        first_line = text_widget._line_offset
+        for match in find_matches(state['pattern'], line, col, text):
+            if match[0] >= first_line:
+                matches.append(match)
+                if len(matches) >= MAX_MATCHES:
+                    state['truncated'] = True
+                    break
+        state['scanned_chunks'] = text_widget._mirror_dropped + len(mirror)
+
+        # Don't move the view (it follows the output), just count and tag
+        if state['current_index'] >= len(matches):
+            state['current_index'] = len(matches) - 1
+        if state['current_index'] < 0 and matches:
+            state['current_index'] = 0
+        self._update_search_label(text_widget)
+        self._schedule_highlight(text_widget)
+
+    def _update_search_label(self, text_widget):
+        state = text_widget.search_state
+        # "…" while still searching, "+" if the search stopped at the match limit
+        suffix = '…' if state['job'] else ('+' if state['truncated'] else '')
+        state['label'].config(text=f"{state['current_index'] + 1}/{len(state['matches'])}{suffix}")
+
+    def _schedule_highlight(self, text_widget):
+        # Re-tag visible matches once the view settles (scrolling, new output)
+        state = getattr(text_widget, 'search_state', None)
+        if not state or not state['matches'] or state['highlight_pending']:
+            return
+        state['highlight_pending'] = True
+        def run():
+            state['highlight_pending'] = False
+            self._highlight_visible(text_widget)
+        self.root.after_idle(run)
+
+    def _highlight_visible(self, text_widget):
+        # Only matches on screen carry the highlight tag; there may be far too many to tag them all
+        state = text_widget.search_state
+        try:
+            text_widget.tag_remove('highlight', '1.0', tk.END)
+            if not state['matches']:
+                return
+            offset = getattr(text_widget, '_line_offset', 0)
+            top = int(text_widget.index('@0,0').split('.')[0])
+            bottom = int(text_widget.index(f"@0,{text_widget.winfo_height()}").split('.')[0])
+        except (tk.TclError, ValueError):
+            return # View closed
+        matches = state['matches']
+        i = bisect.bisect_left(matches, (offset + top - 1,))
+        last = offset + bottom - 1
+        while i < len(matches) and matches[i][0] <= last:
+            line, col, length = matches[i]
+            pos = f"{line - offset + 1}.{col}"
+            text_widget.tag_add('highlight', pos, f"{pos}+{length}c")
+            i += 1
 
     def _highlight_current(self, text_widget):
         state = text_widget.search_state
@@ -546,14 +1284,21 @@ class ScriptsTab(ttk.Frame):
             return
             
         # Update Label
-        state['label'].config(text=f"{idx + 1}/{len(matches)}")
+        self._update_search_label(text_widget)
         
+        line, col, length = matches[idx]
+        if text_widget is self.history_text:
+            self._show_history_line(line) # Loads the page holding the match
+        row = line - getattr(text_widget, '_line_offset', 0) + 1
+        if row < 1:
+            return # Evicted
+
         # Highlight current
         text_widget.tag_remove('current_match', '1.0', tk.END)
-        current_pos = matches[idx]
-        end_pos = f"{current_pos}+{len(state['query'])}c"
-        text_widget.tag_add('current_match', current_pos, end_pos)
+        current_pos = f"{row}.{col}"
+        text_widget.tag_add('current_match', current_pos, f"{current_pos}+{length}c")
         text_widget.see(current_pos)
+        self._highlight_visible(text_widget)
 
     def _find_next(self, text_widget, entry):
         query = entry.get()
@@ -586,406 +1331,181 @@ class ScriptsTab(ttk.Frame):
             self.root.overrideredirect(True)
             self.root.unbind('<FocusIn>')
 
-    def _create_text_with_gutter(self, parent, height=10):
+    def _create_text_with_gutter(self, parent, height=10, on_scroll=None):
         container = ttk.Frame(parent)
+        font = ("Consolas", 10)
         
-        # Gutter (Line Numbers)
-        gutter = tk.Text(container, width=4, padx=4, takefocus=0, border=0, state='disabled', font=("Consolas", 10))
+        # Gutter (Line Numbers): a canvas that only ever draws the rows on screen
+        gutter = tk.Canvas(container, takefocus=0, borderwidth=0, highlightthickness=0)
+        gutter.font = tkfont.Font(font=font)
+        self._set_gutter_digits(gutter, 3)
         gutter.pack(side='left', fill='y')
         
         # Main Text
-        text_widget = tk.Text(container, height=height, font=("Consolas", 10), wrap='none')
+        text_widget = tk.Text(container, height=height, font=font, wrap='none')
         text_widget.pack(side='left', expand=True, fill='both')
         
         # Scrollbar
-        scrollbar = ttk.Scrollbar(container, orient=tk.VERTICAL, command=lambda *args: self._on_text_scroll(text_widget, gutter, *args))
-        text_widget.configure(yscrollcommand=lambda *args: self._on_scrollbar_scroll(scrollbar, gutter, *args))
+        scrollbar = ttk.Scrollbar(container, orient=tk.VERTICAL, command=text_widget.yview)
+        def on_yscroll(*args):
+            scrollbar.set(*args)
+            self._update_line_numbers(text_widget, gutter)
+            self._schedule_highlight(text_widget)
+            if on_scroll:
+                on_scroll(*args)
+        text_widget.configure(yscrollcommand=on_yscroll)
         
         scrollbar.pack(side='right', fill='y')
         
         # Bind events for line number updates
-        text_widget.bind('<KeyRelease>', lambda e: self._update_line_numbers(text_widget, gutter))
-        text_widget.bind('<MouseWheel>', lambda e: self._update_line_numbers(text_widget, gutter))
-        text_widget.bind('<Button-1>', lambda e: self._update_line_numbers(text_widget, gutter))
         text_widget.bind('<Configure>', lambda e: self._update_line_numbers(text_widget, gutter))
         
         # Store gutter reference on text widget for easy access
         text_widget.gutter = gutter
+        text_widget._gutter_pending = False
         
         return container, text_widget, gutter
 
-    def _on_text_scroll(self, text_widget, gutter, *args):
-        text_widget.yview(*args)
-        gutter.yview(*args)
-
-    def _on_scrollbar_scroll(self, scrollbar, other_widget, *args):
-        scrollbar.set(*args)
-        other_widget.yview_moveto(args[0])
-
     def _update_line_numbers(self, text_widget, gutter):
-        # Efficiently get line count without reading all text
-        try:
-            lines = int(text_widget.index('end-1c').split('.')[0])
-        except ValueError:
-            lines = 1
-
-        # Only update text if line count changed
-        current_lines = getattr(text_widget, '_current_lines', 0)
-        if lines != current_lines:
-            line_numbers = '\n'.join(str(i) for i in range(1, lines + 1))
-            
-            gutter.config(state='normal')
-            gutter.delete('1.0', tk.END)
-            gutter.insert('1.0', line_numbers)
-            gutter.config(state='disabled')
-            
-            text_widget._current_lines = lines
-        
-        # Always sync yview
-        gutter.yview_moveto(text_widget.yview()[0])
+        # Redraw once the display is up to date (dlineinfo needs it); calls coalesce
+        if text_widget._gutter_pending:
+            return
+        text_widget._gutter_pending = True
+        def draw():
+            text_widget._gutter_pending = False
+            try:
+                self._draw_line_numbers(text_widget, gutter)
+            except tk.TclError:
+                pass # View closed
+        self.root.after_idle(draw)
+
+    def _set_gutter_digits(self, gutter, digits):
+        width = gutter.font.measure('0' * digits) + 12
+        gutter.config(width=width)
+        gutter.digits = digits
+        gutter.right = width - 6 # Numbers are right-aligned here
+
+    def _draw_line_numbers(self, text_widget, gutter):
+        # Cost depends on the rows on screen only, not on how many lines there are
+        offset = getattr(text_widget, '_line_offset', 0) # Lines evicted / not loaded above
+        last = int(text_widget.index('end-1c').split('.')[0]) + offset
+
+        # Wide enough for the largest number, resized only when the digit count changes
+        digits = max(3, len(str(last)))
+        if digits != gutter.digits:
+            self._set_gutter_digits(gutter, digits)
+
+        gutter.delete('all')
+        color = text_widget.cget('foreground')
+        index = text_widget.index('@0,0 linestart')
+        while True:
+            info = text_widget.dlineinfo(index)
+            if info is None:
+                break # Below the visible area
+            line = int(index.split('.')[0])
+            gutter.create_text(gutter.right, info[1], anchor='ne', text=str(line + offset), font=gutter.font, fill=color)
+            next_index = text_widget.index(f"{index}+1line linestart")
+            if next_index == index or int(next_index.split('.')[0]) == line:
+                break # Last line
+            index = next_index
+
+    @property
+    def scripts(self):
+        return self.runner.scripts # Map name -> full path
 
     def scan_scripts(self):
-        self.scripts = {}
-        if os.path.exists(self.scripts_dir):
-            for f in os.listdir(self.scripts_dir):
-                if f.endswith('.ps1') or f.endswith('.sh') or f.endswith('.bat') or f.endswith('.py'):
-                    self.scripts[f] = os.path.join(self.scripts_dir, f)
+        self.runner.scan_scripts()
 
     def get_scripts_metadata(self):
-        metadata = []
-        if not self.scripts:
-            self.scan_scripts()
-
-        for filename, path in self.scripts.items():
-            display_name = self._format_script_name(filename)
-            description, flags = self.get_script_details(filename)
-            metadata.append((filename, display_name, description, flags))
-        return metadata
-
-    def _format_script_name(self, filename):
-        # Remove extension
-        name = os.path.splitext(filename)[0]
-        # Replace underscores with spaces
-        name = name.replace('_', ' ')
-        # Title Case
-        return name.title()
+        return self.runner.get_scripts_metadata()
 
     def get_script_details(self, script_name):
-        script_path = self.scripts.get(script_name)
-        description = "Unknown Script"
-        flags = []
-        
-        if not script_path:
-            return description, flags
-        
-        try:
-            with open(script_path, 'r', encoding='utf-8', errors='ignore') as f:
-                # Read first few lines
-                for _ in range(15):
-                    line = f.readline()
-                    if not line:
-                        break
-                    if "Description:" in line:
-                        description = line.split("Description:", 1)[1].strip()
-                    if "Flags:" in line:
-                        flags_str = line.split("Flags:", 1)[1].strip()
-                        flags = [f.strip() for f in flags_str.split(',') if f.strip()]
-        except Exception:
-            pass
-
-        if description == "Unknown Script":
-            # Fallback
-            ext = os.path.splitext(script_name)[1]
-            if ext == '.ps1':
-                description = "PowerShell Script"
-            elif ext == '.sh':
-                description = "Shell Script (Bash)"
-            elif ext == '.py':
-                description = "Python Script"
-            else:
-                description = "Executable Script"
-                
-        return description, flags
+        return self.runner.get_script_details(script_name)
 
-    def abort_script(self):
-        if self.current_process and self.current_process.poll() is None:
-            try:
-                self.current_process.terminate() # Try nice termination first
-                self._reset_input_style()
-                self.append_log("\n!!! Script aborted by user !!!\n", 'error')
-            except Exception as e:
-                self.append_log(f"Error aborting script: {str(e)}\n", 'error')
-        else:
+    def abort_script(self, run=None):
+        run = run or self._selected_run()
+        if run is None or not run.is_active:
             self.append_log("No running script to abort.\n", 'info')
-
-    def send_input(self, text):
-        if self.current_process and self.current_process.poll() is None:
-            try:
-                if self.current_process.stdin:
-                    self.current_process.stdin.write((text + "\r\n").encode('utf-8'))
-                    self.current_process.stdin.flush()
-            except Exception as e:
-                self.append_log(f"Error sending input: {str(e)}\n", 'error')
-
-    def run_script(self, script_name, flags=None):
-        script_path = self.scripts.get(script_name)
-        if not script_path:
             return
 
-        # Add separator
-        self.append_log(f"{'='*50}\nRunning {script_name} at {time.strftime('%H:%M:%S')}\n{'='*50}\n", 'info')
-
-        # Run in a separate thread to keep UI responsive
-        thread = threading.Thread(target=self._execute_script_thread, args=(script_name, script_path, flags))
-        thread.start()
+        if run.status == 'queued':
+            self.run_manager.cancel(run)
+            self.append_log("Run cancelled before it started.\n", 'info', run.view)
+            return
 
-    def _execute_script_thread(self, script_name, script_path, flags=None):
         try:
-            # Determine command based on extension
-            if script_name.endswith('.ps1'):
-                cmd = ["powershell", "-ExecutionPolicy", "Bypass", "-File", script_path]
-            elif script_name.endswith('.sh'):
-                # Try to find Git Bash on Windows
-                git_bash_path = r"C:\Program Files\Git\bin\bash.exe"
-                if os.path.exists(git_bash_path):
-                    cmd = [git_bash_path, script_path]
-                else:
-                    # Fallback to system bash (might be WSL)
-                    cmd = ["bash", script_path] 
-            elif script_name.endswith('.py'):
-                cmd = ["python", "-u", script_path] # -u for unbuffered output
-            elif script_name.endswith('.bat'):
-                cmd = ["cmd.exe", "/c", script_path]
-            else:
-                cmd = [script_path]
-            
-            # Append flags if any
-            if flags:
-                cmd.extend(flags)
-
-            self.current_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.PIPE, # Enable stdin
-                text=False, # Binary mode for unbuffered reading
-                bufsize=0,  # Unbuffered
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
-            
-            process = self.current_process
-            
-            # Logging Setup
-            script_log_dir = os.path.join(self.logs_dir, script_name)
-            if not os.path.exists(script_log_dir):
-                os.makedirs(script_log_dir)
-            
-            timestamp = time.strftime('%Y-%m-%d_%H-%M-%S')
-            log_file_path = os.path.join(script_log_dir, f"{timestamp}.log")
-            
-            # Open log file
-            try:
-                log_file = open(log_file_path, 'w', encoding='utf-8')
-            except Exception as e:
-                self.root.after(0, self.append_log, f"Error opening log file: {e}\n", 'error')
-                log_file = None
-
-            # Read output line by line with queue-based ordering
-            output_queue = queue.Queue()
-            buffer = []
-            last_flush = time.time()
-            
-            def process_output_queue():
-                """Process queued output in UI thread"""
-                try:
-                    nonlocal buffer, last_flush
-                    
-                    # Track last scroll time for periodic scrolling
-                    if not hasattr(process_output_queue, 'last_scroll'):
-                        process_output_queue.last_scroll = time.time()
-                    
-                    # Pull items from queue - process ALL available items
-                    items_processed = 0
-                    try:
-                        while items_processed < 1000:  # Safety limit per iteration
-                            item = output_queue.get_nowait()
-                            # print(f"DEBUG: process_output_queue got item: {item}") # Uncomment if needed
-                            if item is None:  # Sentinel for end
-                                # Flush remaining buffer - final flush, DO update search
-                                if buffer:
-                                    if hasattr(self, 'append_log_batch'):
-                                        self.append_log_batch(buffer, skip_search_update=False)
-                                    else:
-                                        for line, tag in buffer:
-                                            self.append_log(line, tag)
-                                return  # Done
-                            
-                            buffer.append(item)
-                            items_processed += 1
-                            
-                            # Flush more aggressively: every 50 lines OR every 5ms
-                            current_time = time.time()
-                            if len(buffer) >= 50 or (current_time - last_flush) > 0.005:
-                                if hasattr(self, 'append_log_batch'):
-                                    # Force UI updates to prevent missing output
-                                    self.append_log_batch(buffer, skip_search_update=True, skip_ui_updates=False)
-                                else:
-                                    for line, tag in buffer:
-                                        self.append_log(line, tag)
-                                buffer = []
-                                last_flush = time.time()
-                                
-                    except queue.Empty:
-                        # Flush any remaining buffer even if not full
-                        if buffer:
-                            current_time = time.time()
-                            if (current_time - last_flush) > 0.005:  # 5ms
-                                if hasattr(self, 'append_log_batch'):
-                                    # Force UI updates to prevent missing output
-                                    self.append_log_batch(buffer, skip_search_update=True, skip_ui_updates=False)
-                                else:
-                                    for line, tag in buffer:
-                                        self.append_log(line, tag)
-                                buffer = []
-                                last_flush = time.time()
-                    
-                    # Periodic scroll to keep output visible (every 100ms)
-                    current_time = time.time()
-                    if (current_time - process_output_queue.last_scroll) > 0.1:
-                        if hasattr(self, 'output_text'):
-                            self.output_text.see("end")
-                        process_output_queue.last_scroll = current_time
-                    
-                    # Schedule next check if process still running - check very frequently
-                    if process.poll() is None or not output_queue.empty():
-                        self.root.after(10, process_output_queue)  # Check every 10ms
-                    else:
-                        # Final flush - DO update search
-                        if buffer:
-                            if hasattr(self, 'append_log_batch'):
-                                self.append_log_batch(buffer, skip_search_update=False)
-                            else:
-                                for line, tag in buffer:
-                                    self.append_log(line, tag)
-                except Exception as e:
-                    print(f"Error in process_output_queue: {e}")
-                    # Try to log to UI if possible
-                    try:
-                        self.output_text.config(state='normal')
-                        self.output_text.insert(tk.END, f"\nUI Error: {e}\n", 'error')
-                        self.output_text.config(state='disabled')
-                    except:
-                        pass
-            
-            def read_stream(stream, is_stderr=False):
-                # Don't blindly tag stderr as error, check content
-                default_tag = None
-                fd = stream.fileno()
-                while True:
-                    try:
-                        # Read raw bytes
-                        data = os.read(fd, 1024)
-                        if not data:
-                            break
-                        
-                        # Decode
-                        text = data.decode('utf-8', errors='replace')
-                        
-                        # We might get partial lines or just prompts without newlines
-                        # The UI append_log handles this fine as it just inserts text
-                        # We might get partial lines or just prompts without newlines
-                        # The UI append_log handles this fine as it just inserts text
-                        # print(f"DEBUG: read_stream putting '{text.strip()}' tag={default_tag}")
-                        output_queue.put((text, default_tag))
-                        
-                        if log_file:
-                            self._write_to_log(log_file, text, script_log_dir, timestamp)
-                    except OSError:
-                        break
-
-            # Start output processor in UI thread
-            self.root.after(0, process_output_queue)
-            
-            # Start stderr reader thread
-            stderr_thread = threading.Thread(target=read_stream, args=(process.stderr, True))
-            stderr_thread.start()
-            
-            # Read stdout in main thread
-            read_stream(process.stdout, False)
-            
-            stderr_thread.join()
-            process.wait()
-            
-            # Queue the completion message BEFORE the sentinel
-            completion_msg = f"\nScript finished with code {process.returncode}\n"
-            output_queue.put((completion_msg, 'info'))
-            
-            # Signal end of output
-            output_queue.put(None)
-            
-            # Wait for queue to be fully processed
-            time.sleep(0.3)
-            
-            if log_file:
-                log_file.close()
-                self._cleanup_logs(script_log_dir)
-            
-            # Reset current process if it matches
-            if self.current_process == process:
-                self.current_process = None
-
-            self.root.after(0, self.on_script_finished)
-
+            if self.runner.abort(run):
+                self._reset_input_style()
+                self.append_log("\n!!! Script aborted by user !!!\n", 'error', run.view)
         except Exception as e:
-            self.root.after(0, self.append_log, f"Error running script: {str(e)}\n", 'error')
-
-    def _write_to_log(self, log_file, content, log_dir, timestamp):
-        try:
-            # Check size (10MB limit)
-            if log_file.tell() > 10 * 1024 * 1024:
-                log_file.close()
-                # Find next part number
-                part = 1
-                while os.path.exists(os.path.join(log_dir, f"{timestamp}_part{part}.log")):
-                    part += 1
-                new_path = os.path.join(log_dir, f"{timestamp}_part{part}.log")
-                log_file = open(new_path, 'w', encoding='utf-8')
-            
-            log_file.write(content)
-            log_file.flush()
-        except Exception:
-            pass # Ignore logging errors to keep script running
+            self.append_log(f"Error aborting script: {str(e)}\n", 'error', run.view)
 
-    def _cleanup_logs(self, log_dir):
+    def send_input(self, text, run=None):
+        run = run or self._input_run()
+        if run is None:
+            return
         try:
-            files = [os.path.join(log_dir, f) for f in os.listdir(log_dir) if f.endswith('.log')]
-            files.sort(key=os.path.getmtime)
-            
-            # Keep last 10
-            while len(files) > 10:
-                os.remove(files[0])
-                files.pop(0)
-        except Exception:
-            pass
+            self.runner.send_input(run, text)
+        except Exception as e:
+            self.append_log(f"Error sending input: {str(e)}\n", 'error', run.view)
+
+    def run_script(self, script_name, flags=None, label=None):
+        if script_name not in self.scripts:
+            return None
+
+        # Each run gets its own output tab; it starts once the run manager has a free slot
+        run = Run(script_name, flags, label)
+        frame, run.view = self._create_console_view(self.run_notebook, run)
+        self.run_views[str(frame)] = run
+        self.run_notebook.add(frame, text=run.label)
+        self.run_notebook.select(frame)
+        self.run_manager.submit(run)
+        return run
+
+    def _start_run(self, run):
+        # Add separator
+        self.append_log(f"{'='*50}\nRunning {run.script_name} at {time.strftime('%H:%M:%S')}\n{'='*50}\n", 'info', run.view)
+
+        # The runner reports from its threads: output goes through a pump that flushes
+        # it on the UI thread and calls on_script_finished once everything is shown
+        pump = OutputPump(
+            self.root,
+            lambda items, final: self._flush_run_output(run, items, final),
+            on_close=lambda: self.on_script_finished(run),
+            size_of=lambda item: len(item[0]),
+            max_size=OUTPUT_FLUSH_CHARS
+        )
+        self.runner.start(
+            run,
+            on_output=lambda text, tag: self._put_output(pump, text, tag),
+            on_finished=lambda run: pump.close(),
+            on_logs_finalized=lambda script_name: self.root.after(0, self._on_logs_finalized, script_name)
+        )
+
+    @staticmethod
+    def _put_output(pump, text, tag):
+        # Big reads are queued in pieces, cut after a newline where there is one
+        start = 0
+        while len(text) - start > OUTPUT_CHUNK_CHARS:
+            end = text.rfind('\n', start, start + OUTPUT_CHUNK_CHARS) + 1 or start + OUTPUT_CHUNK_CHARS
+            pump.put((text[start:end], tag))
+            start = end
+        pump.put((text[start:], tag))
+
+    def _on_logs_finalized(self, script_name):
+        # Compressed names replace the plain ones in the history list
+        if self._selected_script() == script_name:
+            self._update_history_list(script_name)
 
     def get_script_history(self, script_name):
-        log_dir = os.path.join(self.logs_dir, script_name)
-        if not os.path.exists(log_dir):
-            return []
         try:
-            files = [f for f in os.listdir(log_dir) if f.endswith('.log')]
-            files.sort(reverse=True) # Newest first
-            return files
+            return self.log_store.list_logs(script_name) # Newest first
         except Exception:
             return []
 
     def get_log_content(self, script_name, filename):
-        path = os.path.join(self.logs_dir, script_name, filename)
-        if not os.path.exists(path):
-            return ""
         try:
-            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
+            return self.log_store.read(script_name, filename)
         except Exception:
             return "Error reading log file."
 
@@ -1,14 +1,18 @@
+import time
+STARTED = time.perf_counter() # Startup is measured from here (see startup_time.py)
+
 import tkinter as tk
 from tkinter import ttk
 import os
-from tabs.script_tab import ScriptsTab
-from tabs.actuator_tab import ActuatorsTab
+import sys
 
 class ScriptManagerUI:
-    def __init__(self, root):
+    def __init__(self, root, on_ready=None):
         self.root = root
         self.root.title("Script Manager")
-        
+        self.on_ready = on_ready # Called with (first_paint, ready) seconds since STARTED
+        self.first_paint = None
+
         # Calculate 80% of screen size and center the window
         screen_width = self.root.winfo_screenwidth()
         screen_height = self.root.winfo_screenheight()
@@ -21,19 +25,53 @@ class ScriptManagerUI:
         # Main Container
         self.main_container = tk.Frame(root)
         self.main_container.pack(fill='both', expand=True)
-        
+
         self.notebook = ttk.Notebook(self.main_container)
         self.notebook.pack(expand=True, fill='both', padx=10, pady=10)
 
-        # Tabs
-        self.scripts_tab = ScriptsTab(self.notebook, self.root)
-        self.actuators_tab = ActuatorsTab(self.notebook)
+        # Tabs: empty frames now, each filled the first time it is shown
+        self.scripts_tab = None
+        self.actuators_tab = None
+        self._tab_builders = {} # Notebook tab id -> (frame, build)
+        self._add_lazy_tab('Scripts', self._build_scripts_tab)
+        self._add_lazy_tab('Actuators', self._build_actuators_tab)
 
-        self.notebook.add(self.scripts_tab, text='Scripts')
-        self.notebook.add(self.actuators_tab, text='Actuators')
+        # The theme and the first tab wait until the window has been drawn
+        self.root.after_idle(lambda: self.root.after(0, self._finish_startup))
 
-        # Apply Theme
+    def _add_lazy_tab(self, text, build):
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=text)
+        self._tab_builders[str(frame)] = (frame, build)
+
+    def _finish_startup(self):
+        self.first_paint = time.perf_counter() - STARTED
         self._apply_theme()
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._on_tab_changed()
+        if self.on_ready:
+            self.on_ready(self.first_paint, time.perf_counter() - STARTED)
+
+    def _on_tab_changed(self, event=None):
+        entry = self._tab_builders.pop(str(self.notebook.select()), None)
+        if entry:
+            frame, build = entry
+            build(frame).pack(fill='both', expand=True)
+
+    def _build_scripts_tab(self, parent):
+        # Imported on first use: the run engine is most of the import time
+        from tabs.script_tab import ScriptsTab
+        self.scripts_tab = ScriptsTab(parent, self.root, region_provider=self._get_regions)
+        return self.scripts_tab
+
+    def _build_actuators_tab(self, parent):
+        from tabs.actuator_tab import ActuatorsTab
+        self.actuators_tab = ActuatorsTab(parent)
+        return self.actuators_tab
+
+    def _get_regions(self):
+        # Fan-out asks before the Actuators tab may have been opened
+        return self.actuators_tab.get_regions() if self.actuators_tab else []
 
     def _apply_theme(self):
         theme_path = os.path.join(os.path.dirname(__file__), "theme", "sv.tcl")
@@ -42,7 +80,15 @@ class ScriptManagerUI:
             style = ttk.Style()
             style.theme_use("sun-valley-dark")
 
+def _report_startup(root, first_paint, ready):
+    # One line for startup_time.py, then quit
+    print(f"startup first_paint={first_paint:.4f} ready={ready:.4f}", flush=True)
+    root.after(0, root.destroy)
+
 if __name__ == "__main__":
     root = tk.Tk()
-    app = ScriptManagerUI(root)
+    on_ready = None
+    if '--startup-time' in sys.argv:
+        on_ready = lambda first_paint, ready: _report_startup(root, first_paint, ready)
+    app = ScriptManagerUI(root, on_ready=on_ready)
     root.mainloop()
@@ -0,0 +1,66 @@
+"""A local stub of Spring Boot actuator endpoints, for the actuator tests."""
+import hashlib
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubActuator(BaseHTTPRequestHandler):
+    """/<app>/<region>/actuator/{info,health}; app 'Down' answers health with 503 and a body."""
+
+    protocol_version = 'HTTP/1.1' # Keep-alive, like a real service
+    version = '1.0'
+    delay = 0.1 # Per request, so a serial client would be obviously slow
+    requests = [] # (path, If-None-Match header)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        app, region, _, kind = self.path.strip('/').split('/')
+        type(self).requests.append((self.path, self.headers.get('If-None-Match')))
+        time.sleep(self.delay)
+        status = 200
+        if kind == 'info':
+            data = {'build': {'version': self.version}, 'git': {'branch': 'main', 'commit': {'id': f"{app}-{region}"}}}
+        elif app == 'Down':
+            status, data = 503, {'status': 'DOWN'}
+        else:
+            data = {'status': 'UP'}
+        body = json.dumps(data).encode()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256 # Every endpoint connects at once
+
+
+def serve_stub():
+    # A StubServer on a free port, serving from a daemon thread; returns (server, base url)
+    StubActuator.version = '1.0'
+    StubActuator.requests = []
+    server = StubServer(('127.0.0.1', 0), StubActuator)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def free_port():
+    # A port nothing listens on
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
@@ -0,0 +1,60 @@
+"""ActuatorClient against a local stub of Spring Boot actuator endpoints.
+
+    python -m pytest tests        (or: python -m unittest discover tests)
+"""
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from actuator_stub import StubActuator, free_port, serve_stub
+from logic.actuator_client import ActuatorClient
+
+
+class ActuatorClientTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server, cls.base = serve_stub()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubActuator.version = '1.0'
+        StubActuator.requests = []
+        self.client = ActuatorClient(timeout=2.0, max_workers=100)
+
+    def tearDown(self):
+        self.client.close()
+
+    def fetch_all(self, endpoints):
+        rows = []
+        done = threading.Event()
+        job = self.client.fetch_all(endpoints, rows.append, done.set)
+        self.assertTrue(done.wait(10), "fetch_all did not finish")
+        return job, rows
+
+    def test_fetch_all_is_concurrent(self):
+        endpoints = [(f"App{i}", region, f"{self.base}/App{i}/{region}") for i in range(25) for region in ('eu', 'us')]
+        job, rows = self.fetch_all(endpoints)
+        self.assertEqual(len(rows), 50)
+        self.assertEqual(job.completed, 50)
+        self.assertIn(('App3', 'us', '1.0', 'main', 'App3-us', 'UP'), rows)
+        # Serially this is 100 requests * StubActuator.delay = 10s
+        self.assertLess(job.duration, 2.5)
+
+    def test_unreachable(self):
+        row = self.client.fetch('Gone', 'eu', f"http://127.0.0.1:{free_port()}")
+        self.assertEqual(row, ('Gone', 'eu', '', '', '', 'UNREACHABLE'))
+
+    def test_down_with_503_body(self):
+        row = self.client.fetch('Down', 'eu', f"{self.base}/Down/eu")
+        self.assertEqual(row, ('Down', 'eu', '1.0', 'main', 'Down-eu', 'DOWN'))
+
+
+if __name__ == '__main__':
+    unittest.main()
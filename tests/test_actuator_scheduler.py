@@ -0,0 +1,72 @@
+"""Background polling of actuator endpoints: conditional requests and the scheduler.
+
+    python -m pytest tests        (or: python -m unittest discover tests)
+"""
+import os
+import queue
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from actuator_stub import StubActuator, serve_stub
+from logic.actuator_client import ActuatorClient, EndpointState
+from logic.actuator_scheduler import ActuatorScheduler
+
+
+class ActuatorPollingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server, cls.base = serve_stub()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubActuator.version = '1.0'
+        StubActuator.requests = []
+        self.client = ActuatorClient(timeout=2.0)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_conditional_requests_reuse_unchanged_answers(self):
+        state = EndpointState('App1', 'eu', f"{self.base}/App1/eu")
+        first = self.client.fetch(state.app, state.region, state.base_url, state)
+        self.assertEqual(state.row, first)
+
+        StubActuator.requests = []
+        second = self.client.fetch(state.app, state.region, state.base_url, state)
+        self.assertIs(second, first) # Nothing re-parsed
+        self.assertEqual(len(StubActuator.requests), 2)
+        self.assertTrue(all(etag for _, etag in StubActuator.requests), "requests were not conditional")
+
+        StubActuator.version = '1.1'
+        third = self.client.fetch(state.app, state.region, state.base_url, state)
+        self.assertEqual(third[2], '1.1')
+
+    def test_changes_seen_while_stopped_are_delivered_after_start(self):
+        results = queue.Queue()
+        scheduler = ActuatorScheduler(self.client, [('App1', 'eu', f"{self.base}/App1/eu")], results.put,
+                                      interval=0.3, jitter=0)
+        scheduler.start()
+        self.assertEqual(results.get(timeout=5)[2], '1.0')
+        scheduler.stop()
+
+        # A manual refresh shares the endpoint's state and notices the deploy first
+        StubActuator.version = '1.1'
+        state = scheduler.states[('App1', 'eu')]
+        self.client.fetch(state.app, state.region, state.base_url, state)
+        self.assertTrue(results.empty())
+
+        scheduler.start()
+        try:
+            self.assertEqual(results.get(timeout=5)[2], '1.1')
+        finally:
+            scheduler.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
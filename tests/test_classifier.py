@@ -0,0 +1,56 @@
+"""LineClassifier rules, including user rules from settings.
+
+    python -m pytest tests        (or: python -m unittest discover tests)
+"""
+import contextlib
+import io
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from logic.classifier import LineClassifier
+
+
+class LineClassifierTest(unittest.TestCase):
+    def from_settings(self, rules):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            classifier = LineClassifier.from_settings({'log_rules': rules})
+        return classifier, output.getvalue()
+
+    def test_default_rules(self):
+        classifier = LineClassifier()
+        self.assertEqual(classifier.classify_batch(['[INFO] ok', 'ERROR: failed', 'WARNING:', 'plain', 'info and error:']),
+                         ['info', 'error', 'warning', None, None])
+
+    def test_user_rules_and_presets(self):
+        classifier, output = self.from_settings(['maven', ['warning', 'deprecated']])
+        self.assertEqual(output, '')
+        self.assertEqual(classifier.classify_batch(['BUILD FAILURE', 'uses a deprecated API']), ['error', 'warning'])
+
+    def test_bad_rules_are_reported_and_skipped(self):
+        classifier, output = self.from_settings([
+            ['error', '(?i)boom'], # Compiles alone, not inside the combined pattern
+            ['error', '(unclosed'],
+            ['warn'],
+            ['info', 42],
+            'no-such-preset',
+            ['warning', 'slow'],
+        ])
+        self.assertEqual(len(output.splitlines()), 5)
+        self.assertIn("'(?i)boom'", output)
+        self.assertEqual(classifier.classify_batch(['boom', 'slow query', 'ERROR: x']), [None, 'warning', 'error'])
+
+    def test_add_rule_leaves_the_classifier_unchanged_on_error(self):
+        classifier = LineClassifier()
+        with self.assertRaises(re.error):
+            classifier.add_rule('error', '(?i)boom')
+        self.assertEqual(classifier.tags, ['error', 'warning', 'info'])
+        self.assertEqual(classifier.classify('ERROR: x'), 'error')
+
+
+if __name__ == '__main__':
+    unittest.main()
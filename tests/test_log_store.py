@@ -0,0 +1,85 @@
+"""LogStore listing and retention of runs rotated into parts.
+
+    python -m pytest tests        (or: python -m unittest discover tests)
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from logic.log_store import LogStore
+from logic.log_writer import RotatingLogWriter
+
+
+class LogStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = LogStore(self._tmp.name, keep_count=3)
+        self.log_dir = self.store.script_dir('job.py')
+        os.makedirs(self.log_dir)
+
+    def tearDown(self):
+        self.store._executor.shutdown()
+        self._tmp.cleanup()
+
+    def make_run(self, stem, parts, age=0):
+        # A finished run's files (head plus parts-1 _partN files), last written age seconds ago
+        mtime = time.time() - age
+        names = [f"{stem}.log"] + [f"{stem}_part{i}.log" for i in range(1, parts)]
+        for name in names:
+            path = os.path.join(self.log_dir, name)
+            with open(path, 'w') as f:
+                f.write('line\n' * 100)
+            os.utime(path, (mtime, mtime))
+        return names
+
+    def test_parts_are_listed_in_order_after_their_run(self):
+        names = ['2026-01-01_10-00-00.log', '2026-01-02_10-00-00.log.gz', '2026-01-02_10-00-00_2.log',
+                 '2026-01-02_10-00-00_part10.log.gz', '2026-01-02_10-00-00_part2.log.gz', '2026-01-02_10-00-00_part1.log']
+        for name in names:
+            open(os.path.join(self.log_dir, name), 'w').close()
+        self.assertEqual(self.store.list_logs('job.py'), [
+            '2026-01-02_10-00-00_2.log',
+            '2026-01-02_10-00-00.log.gz',
+            '2026-01-02_10-00-00_part1.log',
+            '2026-01-02_10-00-00_part2.log.gz',
+            '2026-01-02_10-00-00_part10.log.gz',
+            '2026-01-01_10-00-00.log',
+        ])
+
+    def test_retention_counts_runs_not_parts(self):
+        oldest = self.make_run('2026-01-01_10-00-00', 1, age=300)
+        kept = self.make_run('2026-01-02_10-00-00', 12, age=200)
+        kept += self.make_run('2026-01-03_10-00-00', 1, age=100)
+        kept += self.make_run('2026-01-04_10-00-00', 5)
+        self.store.apply_retention('job.py')
+        remaining = os.listdir(self.log_dir)
+        self.assertEqual(sorted(remaining), sorted(kept))
+        self.assertNotIn(oldest[0], remaining)
+
+    def test_finalize_keeps_every_part_of_the_run(self):
+        self.store.max_total_bytes = 50000 # Less than the run itself
+        self.make_run('2026-01-01_10-00-00', 1, age=100)
+        writer = RotatingLogWriter.create(self.log_dir, '2026-01-02_10-00-00', max_bytes=20000, on_open=self.store.hold)
+        writer.write(''.join(f"line {i}\n" for i in range(30000))) # ~230 KB, 12 parts
+        writer.close()
+        self.assertGreater(len(writer.paths), 10)
+
+        self.store.finalize('job.py', writer.paths).result()
+        self.assertEqual(self.store.list_logs('job.py'),
+                         [os.path.basename(path) + '.gz' for path in writer.paths])
+
+    def test_runs_in_use_are_not_removed(self):
+        self.store.keep_count = 1
+        running = self.make_run('2026-01-01_10-00-00', 3, age=100)
+        self.make_run('2026-01-02_10-00-00', 1)
+        self.store.hold(os.path.join(self.log_dir, running[-1]))
+        self.store.apply_retention('job.py')
+        self.assertEqual(len(os.listdir(self.log_dir)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
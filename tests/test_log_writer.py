@@ -0,0 +1,97 @@
+"""RotatingLogWriter size-based rotation, and AsyncLogWriter backpressure.
+
+    python -m pytest tests        (or: python -m unittest discover tests)
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from logic.log_writer import AsyncLogWriter, RotatingLogWriter
+
+
+class RotatingLogWriterTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log_dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def parts(self, writer):
+        contents = []
+        for path in writer.paths:
+            with open(path, 'rb') as f:
+                contents.append(f.read())
+        return contents
+
+    def test_one_large_write_is_split_into_parts_within_the_limit(self):
+        text = ''.join(f"line {i} of a flood of output\n" for i in range(40000)) # ~1.2 MB
+        writer = RotatingLogWriter.create(self.log_dir, 'run', max_bytes=100000)
+        writer.write(text)
+        writer.close()
+
+        parts = self.parts(writer)
+        self.assertGreater(len(parts), 10)
+        self.assertTrue(all(len(part) <= 100000 for part in parts))
+        self.assertTrue(all(part.endswith(b'\n') for part in parts), "parts should split on line boundaries")
+        self.assertEqual(b''.join(parts), text.encode())
+        self.assertEqual(writer.dropped_bytes, 0)
+
+    def test_a_line_longer_than_a_part_is_cut(self):
+        text = 'é' * 150000 + '\nend\n' # 300 KB line of two-byte characters
+        writer = RotatingLogWriter.create(self.log_dir, 'run', max_bytes=100001)
+        writer.write('start\n')
+        writer.write(text)
+        writer.close()
+
+        parts = self.parts(writer)
+        self.assertTrue(all(len(part) <= 100001 for part in parts))
+        self.assertEqual(parts[0], b'start\n')
+        self.assertEqual(b''.join(parts), ('start\n' + text).encode())
+        for part in parts:
+            part.decode('utf-8') # Cut between characters, never inside one
+
+    def test_small_writes_fill_parts_up_to_the_limit(self):
+        writer = RotatingLogWriter.create(self.log_dir, 'run', max_bytes=1000)
+        for i in range(500):
+            writer.write(f"{i:08d}\n")
+        writer.close()
+
+        parts = self.parts(writer)
+        self.assertEqual([len(part) for part in parts], [999] * 4 + [4500 - 999 * 4])
+        self.assertEqual(os.path.basename(writer.paths[1]), 'run_part1.log')
+
+
+class AsyncLogWriterTest(unittest.TestCase):
+    def test_a_backlogged_log_waits_instead_of_dropping(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            service = AsyncLogWriter(max_pending_bytes=1000)
+            handle = service.open(log_dir, 'run')
+            write = handle.writer.write
+            def slow_write(text):
+                time.sleep(0.01) # A slow disk
+                write(text)
+            handle.writer.write = slow_write
+
+            waits = 0
+            lines = [f"{i:099d}\n" for i in range(100)]
+            for line in lines:
+                handle.write(line)
+                if handle.backlogged:
+                    waits += 1
+                    self.assertTrue(handle.wait(5), "the writer never caught up")
+            handle.close(5)
+
+            self.assertGreater(waits, 0)
+            self.assertEqual(handle.dropped_bytes, 0)
+            self.assertEqual(handle.pending_bytes, 0)
+            with open(handle.path) as f:
+                self.assertEqual(f.read(), ''.join(lines))
+
+
+if __name__ == '__main__':
+    unittest.main()